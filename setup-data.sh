@@ -4,8 +4,8 @@
 rm -rf .dagster_home/.*/ .dagster_home/*/
 
 # delete directories and contents (or create if they don't exist)
-mkdir -p data/landing data/bronze data/silver data/gold
-find data/landing data/bronze data/silver data/gold -mindepth 1 -delete
+mkdir -p data/landing data/staging data/bronze data/silver data/gold
+find data/landing data/staging data/bronze data/silver data/gold -mindepth 1 -delete
 
 # create directories
 mkdir -p data/landing/1001
@@ -1,4 +1,5 @@
 import polars as pl
+import polars_hash as plh
 import dagster as dg
 import datetime as dt
 from dagster_demo.components.logger import logger
@@ -17,17 +18,61 @@ def add_data_provider_code(context: dg.AssetExecutionContext, df: pl.LazyFrame):
     )
 
 
+def apply_bronze_storage_mode(df: pl.LazyFrame, config) -> pl.LazyFrame:
+    """Cast source columns according to the retailer's `BRONZE_STORAGE_MODE`.
+
+    - "string": cast everything to string. Schema enforcement happens in silver layer.
+    - "typed": cast the columns of `BRONZE_SCHEMA_HINT` to their declared dtype, so measures,
+      dates and ids are stored compactly and silver reads them without re-parsing.
+      Columns outside the hint are stored as strings like in "string" mode,
+      so undeclared or drifting columns still merge into the bronze schema.
+    """
+    if config.BRONZE_STORAGE_MODE == "string":
+        return df.with_columns(pl.exclude(pl.String).cast(str))
+    if config.BRONZE_STORAGE_MODE == "typed":
+        schema_hint = config.BRONZE_SCHEMA_HINT
+        return df.with_columns(
+            *[pl.col(col).cast(dtype) for col, dtype in schema_hint.items()],
+            pl.exclude(pl.String).exclude(*schema_hint.keys()).cast(str),
+        )
+    raise ValueError(f"Unknown bronze storage mode: {config.BRONZE_STORAGE_MODE}")
+
+
+# xxh3_64 of a bronze row's source columns, identifies re-sent rows downstream
+ROW_FINGERPRINT_COL = "row_fingerprint"
+
+
+def add_row_fingerprint(df: pl.LazyFrame) -> pl.LazyFrame:
+    """Hash the source columns of every row into `row_fingerprint`.
+
+    Columns are hashed in name order, so files listing the same columns
+    in another order produce the same fingerprint.
+    """
+    source_cols = sorted(df.collect_schema().names())
+    # Cast all columns to string and fill nulls for hash stability
+    cast_exprs = [pl.col(col).cast(pl.String).fill_null("") for col in source_cols]
+    return df.with_columns(
+        # fast hash function returns UInt64, reinterpret as Int64 for Delta Lake compatibility
+        plh.concat_str(cast_exprs, separator="|")
+        .nchash.xxh3_64()
+        .reinterpret(signed=True)
+        .alias(ROW_FINGERPRINT_COL)
+    )
+
+
 def bronze_processing(context: dg.AssetExecutionContext, df: pl.LazyFrame, config):
-    df = df.with_columns(
-        pl.exclude(pl.String).cast(str)
-    )  # cast everything to string. Schema enforcement happens in silver layer
+    df = apply_bronze_storage_mode(df, config)
+    df = add_row_fingerprint(df)
+    context.add_output_metadata(
+        {"Bronze storage mode": dg.MetadataValue.text(config.BRONZE_STORAGE_MODE)}
+    )
     df = df.with_columns(secure_group_key=config.SECURE_GROUP_KEY)
     df = add_data_provider_code(context, df)
     df = add_ingestion_metadata(
         df=df,
         data_source=config.DATA_SOURCE_NAME,
     )
-    add_materialization_metadata(
+    df = add_materialization_metadata(
         context=context, df=df, count_dates_in_col=config.DATE_COLUMN
     )
     return df
@@ -0,0 +1,120 @@
+import dagster as dg
+import polars as pl
+from deltalake import DeltaTable
+from dagster_demo.components.logger import logger
+
+# asset input metadata key listing the key columns of an input read as a change data feed
+CHANGE_DATA_FEED_METADATA_KEY = "change_data_feed_keys"
+# table configuration recording the row changes of every commit
+# (applied at table creation, and set on existing tables by the lakehouse IO manager)
+CHANGE_DATA_FEED_TABLE_CONFIG = {"delta.enableChangeDataFeed": "true"}
+# materialization metadata key prefix of the upstream table version an input was read at
+CONSUMED_VERSION_METADATA_KEY = "Consumed version"
+
+
+def consumed_version_key(upstream_key: dg.AssetKey) -> str:
+    """Materialization metadata key of the `upstream_key` table version an asset read."""
+    return f"{CONSUMED_VERSION_METADATA_KEY}: {upstream_key.to_user_string()}"
+
+
+def _consumed_version_key(context: dg.InputContext) -> str:
+    return consumed_version_key(context.upstream_output.asset_key)
+
+
+def table_version(table: DeltaTable) -> dict:
+    """Version of `table`, with the id of the table so a recreated table is not mistaken for it."""
+    return {"version": table.version(), "table_id": table.metadata().id}
+
+
+def read_changes(table: DeltaTable, consumed: dict | None) -> pl.DataFrame | None:
+    """Return the rows inserted or updated in `table` after the `consumed` version,
+    with their `_commit_version`, up to the version `table` was opened at.
+
+    Returns None, for a full read, when nothing was consumed yet, when the table was
+    recreated since, or when the feed of the range is not available (its change files
+    were vacuumed). Commits written before the feed was enabled are read at file level:
+    every row of a rewritten file is returned, a superset of the changed rows.
+    """
+    version = table_version(table)
+    if (
+        consumed is None
+        or consumed["table_id"] != version["table_id"]
+        or consumed["version"] > version["version"]
+    ):
+        return None
+    if consumed["version"] == version["version"]:
+        logger.info(
+            f"No changes in {table.table_uri} since version {consumed['version']}"
+        )
+        return pl.DataFrame(
+            schema={
+                **pl.scan_delta(table).collect_schema(),
+                "_commit_version": pl.Int64,
+            }
+        )
+
+    try:
+        changes = pl.DataFrame(
+            table.load_cdf(
+                starting_version=consumed["version"] + 1,
+                ending_version=version["version"],
+            ).read_all()
+        )
+    except Exception as e:
+        logger.warning(f"Change data feed of {table.table_uri} not available ({e})")
+        return None
+    logger.info(
+        f"Read {changes.height} changes of {table.table_uri} "
+        f"from version {consumed['version']} to {version['version']}"
+    )
+    return changes.filter(
+        pl.col("_change_type").is_in(["insert", "update_postimage"])
+    ).drop("_change_type", "_commit_timestamp")
+
+
+def _last_consumed_version(context: dg.InputContext) -> dict | None:
+    """Upstream table version read by the last materialization of the downstream asset
+    (partition), None when it never materialized or did not record one."""
+    records = context.instance.fetch_materializations(
+        dg.AssetRecordsFilter(
+            asset_key=context.step_context.assets_def.key,
+            asset_partitions=[context.partition_key]
+            if context.has_partition_key
+            else None,
+        ),
+        limit=1,
+    ).records
+    if not records or records[0].asset_materialization is None:
+        return None
+    consumed = records[0].asset_materialization.metadata.get(
+        _consumed_version_key(context)
+    )
+    return consumed.value if consumed is not None else None
+
+
+def load_changes(
+    context: dg.InputContext,
+    table_uri: str,
+    key_cols: list[str],
+    storage_options: dict[str, str] | None = None,
+) -> pl.DataFrame | None:
+    """Return the rows of `table_uri` inserted or updated since the downstream asset last read it.
+
+    The table version read is recorded on the downstream materialization. The changes are
+    read from the delta change data feed between that version and the current one, keeping
+    the latest image of every `key_cols` row. Returns None, for a full read, in the cases
+    listed in `read_changes`. Deleted rows are not returned.
+    """
+    table = DeltaTable(table_uri, storage_options=storage_options or None)
+    context.step_context.add_output_metadata(
+        {_consumed_version_key(context): dg.MetadataValue.json(table_version(table))}
+    )
+
+    changes = read_changes(table, _last_consumed_version(context))
+    if changes is None:
+        return None
+    return (
+        changes.sort("_commit_version")
+        .unique(subset=key_cols, keep="last", maintain_order=True)
+        .drop("_commit_version")
+    )
@@ -9,3 +9,7 @@ def build_retailer_config(RETAILER_ID: int):
     REGION = RETAILER_CONFIG[RETAILER_ID]["region"]
     COUNTRY = RETAILER_CONFIG[RETAILER_ID]["country"]
     return DIRECTORY, SECURE_GROUP_KEY, RETAILER_NAME, REGION, COUNTRY
+
+
+def build_data_provider_code(RETAILER_ID: int) -> str:
+    return f"cds_{RETAILER_ID}"
@@ -1,4 +1,22 @@
 LANDING_ZONE = "data/landing"
+# per-directory file index kept by the landing zone sensors
+LANDING_INDEX_ROOT = f"{LANDING_ZONE}/_index"
+# landing file -> partition keys it contains, for partitioned bronze assets
+PARTITION_INDEX_ROOT = f"{LANDING_INDEX_ROOT}/partitions"
+# landing files already appended to bronze, one delta table per bronze asset
+INGESTION_MANIFEST_ROOT = "data/bronze/_manifest"
+# natural key -> dense integer code of silver, one delta table per retailer and key
+KEY_DICTIONARY_ROOT = "data/silver/_key_dictionary"
+# text landing files converted once to parquet on arrival, mirroring the landing layout
+STAGING_ZONE = "data/staging"
+# corporate master data extracts, published as lookup tables by the corporate assets
+CORPORATE_PRODUCT_MASTER_DATA_PATH = "faker/data/corporate_product_master_data.parquet"
+CORPORATE_SITE_MASTER_DATA_PATH = "faker/data/corporate_site_master_data.parquet"
+# run tags of partition range runs, as set by dagster backfills
+ASSET_PARTITION_RANGE_START_TAG = "dagster/asset_partition_range_start"
+ASSET_PARTITION_RANGE_END_TAG = "dagster/asset_partition_range_end"
+# asset tag of retailer assets, matched against data provider partition keys
+DATA_PROVIDER_CODE_TAG = "data_provider_code"
 
 RETAILER_CONFIG = {
     1001: {
@@ -0,0 +1,254 @@
+import dagster as dg
+import polars as pl
+from arro3.core import RecordBatchReader, Table
+from deltalake import DeltaTable, Schema, write_deltalake
+from deltalake.writer._conversion import _convert_arro3_schema_to_delta
+from dagster_delta import DeltaLakePolarsIOManager
+from pydantic import Field
+from dagster_demo.components.change_data_feed import (
+    CHANGE_DATA_FEED_METADATA_KEY,
+    load_changes,
+)
+from dagster_demo.components.constants import DATA_PROVIDER_CODE_TAG
+from dagster_demo.components.logger import logger
+from dagster_demo.components.dimension_cache import (
+    DEFAULT_DIMENSION_CACHE_MB,
+    DIMENSION_CACHE_METADATA_KEY,
+    load_dimension,
+)
+from dagster_demo.components.merge_predicate import PARTITION_BY_METADATA_KEY
+from dagster_demo.components.streaming import (
+    EXECUTION_MODE_METADATA_KEY,
+    WRITE_BATCH_BUDGET_METADATA_KEY,
+    batch_rows_for_budget,
+    stream_batches,
+)
+
+
+def _create_partitioned_table(
+    context: dg.OutputContext, table_slice, obj: pl.DataFrame | pl.LazyFrame, connection
+):
+    """Create the table partitioned by the asset's `partition_by` metadata columns
+    (after the dagster partition columns) if it does not exist yet.
+    Existing tables keep their layout, repartitioning requires a rebuild."""
+    partition_by = (context.definition_metadata or {}).get(PARTITION_BY_METADATA_KEY)
+    if not partition_by or DeltaTable.is_deltatable(
+        connection.table_uri, storage_options=connection.storage_options
+    ):
+        return
+    partition_cols = [
+        dimension.partition_expr for dimension in table_slice.partition_dimensions or []
+    ] + partition_by
+    schema = Table.from_arrow(obj.clear().lazy().collect()).schema
+    DeltaTable.create(
+        table_uri=connection.table_uri,
+        schema=Schema.from_arrow(_convert_arro3_schema_to_delta(schema)),
+        partition_by=partition_cols,
+        configuration=(context.definition_metadata or {}).get("table_configuration", {})
+        | (connection.table_config or {}),
+        storage_options=connection.storage_options,
+    )
+    logger.info(f"Created {connection.table_uri} partitioned by {partition_cols}")
+
+
+def _apply_table_config(connection):
+    """Set the `table_config` properties an existing table is missing.
+    delta-rs applies them only at creation, so tables created before a property was
+    configured (e.g. the change data feed of silver) get it before their next write."""
+    if not connection.table_config or not DeltaTable.is_deltatable(
+        connection.table_uri, storage_options=connection.storage_options
+    ):
+        return
+    table = DeltaTable(connection.table_uri, storage_options=connection.storage_options)
+    configuration = table.metadata().configuration
+    missing = {
+        key: value
+        for key, value in connection.table_config.items()
+        if configuration.get(key) != value
+    }
+    if missing:
+        table.alter.set_table_properties(missing)
+        logger.info(f"Set table properties {missing} on {connection.table_uri}")
+
+
+def _is_table_without_files(connection) -> bool:
+    return (
+        DeltaTable.is_deltatable(
+            connection.table_uri, storage_options=connection.storage_options
+        )
+        and not DeltaTable(
+            connection.table_uri, storage_options=connection.storage_options
+        ).file_uris()
+    )
+
+
+def _feeds_other_data_provider(context: dg.InputContext) -> bool:
+    """Whether the input is a retailer table (tagged with its data provider code) loaded by
+    a run of another data provider partition, which never reads its rows."""
+    data_provider_code = context.upstream_output.asset_spec.tags.get(
+        DATA_PROVIDER_CODE_TAG
+    )
+    if data_provider_code is None or not context.has_partition_key:
+        return False
+    downstream_metadata = context.step_context.assets_def.metadata_by_key.values()
+    partitioned_by_data_provider = any(
+        metadata.get("partition_expr") == DATA_PROVIDER_CODE_TAG
+        for metadata in downstream_metadata
+    )
+    return partitioned_by_data_provider and data_provider_code != context.partition_key
+
+
+def _delegate_type_handler(handled_type: type):
+    """Return the DeltaLakePolarsIOManager type handler of `handled_type`."""
+    (handler,) = [
+        handler
+        for handler in DeltaLakePolarsIOManager.type_handlers()
+        if handled_type in handler.supported_types
+    ]
+    return handler
+
+
+class _LakehouseDeltaLakePolarsTypeHandler:
+    """Polars type handler wrapping the one of DeltaLakePolarsIOManager.
+    Streamed frames are written by its arrow type handler, as record batch readers."""
+
+    def __init__(self):
+        self._polars_handler = _delegate_type_handler(pl.LazyFrame)
+        self._arrow_handler = _delegate_type_handler(RecordBatchReader)
+
+    @property
+    def supported_types(self):
+        return [pl.DataFrame, pl.LazyFrame]
+
+    def load_input(self, context: dg.InputContext, table_slice, connection):
+        if _feeds_other_data_provider(context):
+            # an empty frame without columns, the table is not opened
+            logger.info(
+                f"Skipping {context.upstream_output.asset_key.to_user_string()} "
+                f"for data provider partition {context.partition_key}"
+            )
+            if context.dagster_type.typing_type == pl.LazyFrame:
+                return pl.LazyFrame()
+            return pl.DataFrame()
+
+        change_data_feed_keys = (context.definition_metadata or {}).get(
+            CHANGE_DATA_FEED_METADATA_KEY
+        )
+        if change_data_feed_keys and not table_slice.partition_dimensions:
+            changes = load_changes(
+                context,
+                connection.table_uri,
+                key_cols=change_data_feed_keys,
+                storage_options=connection.storage_options,
+            )
+            if changes is not None:
+                if context.dagster_type.typing_type == pl.LazyFrame:
+                    return changes.lazy()
+                return changes
+
+        upstream_metadata = context.upstream_output.definition_metadata or {}
+        if (
+            not upstream_metadata.get(DIMENSION_CACHE_METADATA_KEY)
+            or table_slice.partition_dimensions
+            or "table_version" in (context.definition_metadata or {})
+        ):
+            return self._polars_handler.load_input(context, table_slice, connection)
+
+        df = load_dimension(
+            connection.table_uri,
+            columns=table_slice.columns,
+            storage_options=connection.storage_options,
+            budget_mb=context.resource_config["dimension_cache_mb"],
+        )
+        if context.dagster_type.typing_type == pl.LazyFrame:
+            return df.lazy()
+        return df
+
+    def handle_output(self, context: dg.OutputContext, table_slice, obj, connection):
+        _create_partitioned_table(context, table_slice, obj, connection)
+        _apply_table_config(connection)
+
+        definition_metadata = context.definition_metadata or {}
+        if (
+            definition_metadata.get("mode") == "overwrite"
+            and table_slice.partition_dimensions
+            and _is_table_without_files(connection)
+        ):
+            # delta-rs fails to resolve the files matching an overwrite predicate on a
+            # table without files, there is nothing to replace: append in one commit
+            write_deltalake(
+                connection.table_uri,
+                obj.collect() if isinstance(obj, pl.LazyFrame) else obj,
+                mode="append",
+                storage_options=connection.storage_options,
+            )
+            table = DeltaTable(
+                connection.table_uri, storage_options=connection.storage_options
+            )
+            context.add_output_metadata(
+                {"table_version": dg.MetadataValue.int(table.version())}
+            )
+            return
+
+        if (
+            not isinstance(obj, pl.LazyFrame)
+            or definition_metadata.get(EXECUTION_MODE_METADATA_KEY) != "streaming"
+        ):
+            return self._polars_handler.handle_output(
+                context, table_slice, obj, connection
+            )
+
+        write_batch_budget_mb = definition_metadata.get(
+            WRITE_BATCH_BUDGET_METADATA_KEY,
+            context.resource_config["write_batch_budget_mb"],
+        )
+        batch_rows = batch_rows_for_budget(obj.collect_schema(), write_batch_budget_mb)
+        self._arrow_handler.handle_output(
+            context, table_slice, stream_batches(obj, batch_rows), connection
+        )
+        context.add_output_metadata(
+            {
+                "Execution mode": dg.MetadataValue.text("streaming"),
+                "Write batch rows": dg.MetadataValue.int(batch_rows),
+                "Write batch budget MB": dg.MetadataValue.int(write_batch_budget_mb),
+            }
+        )
+
+
+class LakehouseDeltaLakePolarsIOManager(DeltaLakePolarsIOManager):
+    """DeltaLakePolarsIOManager for the silver and gold layers, driven by asset metadata:
+
+    - `"execution_mode": "streaming"`: the plan runs on polars' streaming engine and is written
+      in batches sized from a write batch budget, without materializing the full frame
+      (see components/streaming.py). The budget does not bound the step's memory.
+    - `"partition_by": [...]`: physical partition columns used when the table is created.
+    - `"dimension_cache": True`: downstream reads of the table are served from an in-process
+      cache keyed by table version (see components/dimension_cache.py).
+    - asset tag `"data_provider_code"`: the retailer table is only loaded by runs of its own
+      partition of assets partitioned on `"partition_expr": "data_provider_code"`,
+      other partitions receive an empty frame without columns.
+    - `"mode": "overwrite"` on partitioned assets: the output is the partition's full
+      snapshot, the rows of the partition are replaced in a single commit (an overwrite with
+      the `partition_expr` predicate) instead of merged.
+    - input metadata `"change_data_feed_keys": [...]`: only the rows changed since the
+      downstream asset (partition) last read the table are loaded, from the delta change
+      data feed (see components/change_data_feed.py).
+
+    Other assets are written as by DeltaLakePolarsIOManager.
+    """
+
+    write_batch_budget_mb: int = Field(
+        default=1024,
+        description='Default memory the write batches of "streaming" assets may use, overridable with the "write_batch_budget_mb" asset metadata. Sizes the batches only, it does not bound the memory of the step.',
+    )
+    dimension_cache_mb: int = Field(
+        default=DEFAULT_DIMENSION_CACHE_MB,
+        description='Size budget of the in-process cache of "dimension_cache" tables.',
+    )
+
+    @staticmethod
+    def type_handlers():
+        return [
+            _LakehouseDeltaLakePolarsTypeHandler(),
+            _delegate_type_handler(RecordBatchReader),
+        ]
@@ -0,0 +1,89 @@
+import polars as pl
+from collections import OrderedDict
+from deltalake import DeltaTable
+from dagster_demo.components.logger import logger
+
+# asset metadata key marking dimension tables read through the in-process cache
+DIMENSION_CACHE_METADATA_KEY = "dimension_cache"
+DEFAULT_DIMENSION_CACHE_MB = 512
+
+
+class VersionedFrameCache:
+    """LRU cache of table reads, keyed by table uri, delta version and selection
+    (the column selection of dimensions, see gold_reader.py for secure group keys).
+
+    A new table version is a new key, so readers never see stale data. Entries of older
+    versions of the same table are dropped on insert, the least recently used entries
+    are evicted once the cached frames exceed the budget (`budget_mb` unless `put`
+    is given one).
+    """
+
+    def __init__(self, budget_mb: int = DEFAULT_DIMENSION_CACHE_MB):
+        self.budget_mb = budget_mb
+        self._entries: OrderedDict[tuple, pl.DataFrame] = OrderedDict()
+
+    def _size_mb(self) -> float:
+        return sum(df.estimated_size("mb") for df in self._entries.values())
+
+    def get(self, table_uri: str, version: int, selection: tuple | None):
+        key = (table_uri, version, selection)
+        df = self._entries.get(key)
+        if df is not None:
+            self._entries.move_to_end(key)
+        return df
+
+    def put(
+        self,
+        table_uri: str,
+        version: int,
+        selection: tuple | None,
+        df: pl.DataFrame,
+        budget_mb: int | None = None,
+    ):
+        budget_mb = budget_mb or self.budget_mb
+        for key in [key for key in self._entries if key[0] == table_uri]:
+            if key[1] != version:
+                del self._entries[key]
+        self._entries[(table_uri, version, selection)] = df
+        while len(self._entries) > 1 and self._size_mb() > budget_mb:
+            evicted_key, _ = self._entries.popitem(last=False)
+            logger.info(f"Cache evicted {evicted_key}")
+
+
+# one per process: it serves the repeated reads of a step (the dims, key dictionaries and
+# secure group key results a step reads more than once), steps run in their own process
+dimension_cache = VersionedFrameCache()
+
+
+def load_dimension(
+    table_uri: str,
+    columns: list[str] | None = None,
+    storage_options: dict[str, str] | None = None,
+    budget_mb: int | None = None,
+    version: int | None = None,
+) -> pl.DataFrame:
+    """Read a dimension table (or the `columns` slice of it) through the in-process cache.
+    The latest `version` when None.
+
+    Only the table version is read from the delta log, without listing its files,
+    the table itself is scanned on a cache miss only. The cache is trimmed to `budget_mb`
+    (the cache's default budget when None) after a miss.
+    """
+    table = DeltaTable(
+        table_uri, storage_options=storage_options or None, without_files=True
+    )
+    version = table.version() if version is None else version
+    columns_key = tuple(columns) if columns else None
+
+    df = dimension_cache.get(table_uri, version, columns_key)
+    if df is not None:
+        logger.info(f"Dimension cache hit: {table_uri} v{version} {columns or '*'}")
+        return df
+
+    df = pl.scan_delta(table_uri, version=version, storage_options=storage_options)
+    if columns:
+        df = df.select(columns)
+    df = df.collect()
+    dimension_cache.put(table_uri, version, columns_key, df, budget_mb=budget_mb)
+    logger.info(f"Dimension cache miss: {table_uri} v{version} {columns or '*'}")
+    return df
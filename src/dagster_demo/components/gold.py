@@ -1,25 +1,45 @@
 import polars as pl
 import dagster as dg
+from dagster_demo.components.key_dictionary import KEY_CODE_COLS
 from dagster_demo.components.logger import logger
 from dagster_demo.components.output_metadata import add_materialization_metadata
+from dagster_demo.components.merge_predicate import narrow_merge_predicate
 from dagster_demo.components.polars_schemas import (
     gold_store_fact_pl_schema,
     gold_prod_dim_pl_schema,
     gold_site_dim_pl_schema,
+    gold_prod_attributes_pl_schema,
+    gold_site_attributes_pl_schema,
 )
 
+# source flag values read as booleans in the attribute tables
+_BOOLEAN_VALUES = {
+    "y": True,
+    "yes": True,
+    "true": True,
+    "n": False,
+    "no": False,
+    "false": False,
+}
+
 
 def gold_generic_processing(
     context: dg.AssetExecutionContext,
-    base_df: pl.LazyFrame,
     assets: list[pl.LazyFrame],
     data_provider_code: str,
+    schema: dict[str, pl.DataType],
 ):
     logger.info(f"filtering to data provider: {data_provider_code}")
+    # the IO manager only loads the retailer tables tagged with the partition's
+    # data provider code, the others arrive as frames without columns
+    assets = [df for df in assets if df.collect_schema().len()]
+    # key dictionary codes are retailer scoped, gold joins on the natural keys
     assets = [
-        df.filter(pl.col("data_provider_code") == data_provider_code) for df in assets
+        df.filter(pl.col("data_provider_code") == data_provider_code).drop(
+            KEY_CODE_COLS.values(), strict=False
+        )
+        for df in assets
     ]
-    assets = [df for df in assets if not df.limit(1).collect().is_empty()]
 
     # Convert extra_attributes from Struct to JSON string
     # Delta writer can't handle structs with different field schemas across partitions
@@ -39,12 +59,9 @@ def gold_generic_processing(
             )
         normalized_assets.append(df)
 
+    # the gold schema comes first, so every gold column is written in its order and dtype
     df = pl.concat(
-        [
-            base_df.filter(pl.col("data_provider_code") == data_provider_code),
-            *normalized_assets,
-        ],
-        how="diagonal_relaxed",
+        [pl.LazyFrame(schema=schema), *normalized_assets], how="diagonal_relaxed"
     )
     context.log.info(f"len: {df.count().collect()}")
     return df
@@ -54,18 +71,13 @@ def gold_prod_dim_processing(
     context: dg.AssetExecutionContext,
     assets: list[pl.LazyFrame],
 ) -> pl.LazyFrame:
-    try:
-        base_df = pl.scan_delta("data/gold/public/gold_prod_dim.delta")
-    except Exception as e:
-        logger.warning(f"encountered {e}, creating empty gold from known schema")
-        base_df = pl.LazyFrame(schema=gold_prod_dim_pl_schema)
     df = gold_generic_processing(
         context=context,
-        base_df=base_df,
         assets=assets,
         data_provider_code=context.partition_key,
+        schema=gold_prod_dim_pl_schema,
     )
-    add_materialization_metadata(
+    df = add_materialization_metadata(
         context=context, df=df, count_rows=False, count_ids_in_col="prod_id"
     )
     return df
@@ -75,43 +87,103 @@ def gold_site_dim_processing(
     context: dg.AssetExecutionContext,
     assets: list[pl.LazyFrame],
 ) -> pl.LazyFrame:
-    try:
-        base_df = pl.scan_delta("data/gold/public/gold_site_dim.delta")
-    except Exception as e:
-        logger.warning(f"encountered {e}, creating empty gold from known schema")
-        base_df = pl.LazyFrame(schema=gold_site_dim_pl_schema)
     df = gold_generic_processing(
         context=context,
-        base_df=base_df,
         assets=assets,
         data_provider_code=context.partition_key,
+        schema=gold_site_dim_pl_schema,
     )
-    add_materialization_metadata(
+    df = add_materialization_metadata(
         context=context, df=df, count_rows=False, count_ids_in_col="site_id"
     )
     return df
 
 
+def extra_attributes_to_rows(df: pl.LazyFrame, key_col: str) -> pl.LazyFrame:
+    """Unpivot the `extra_attributes` struct of `df` to one row per `key_col` and attribute.
+
+    The value is kept as `value_string` and cast to each type it parses as (`value_int`,
+    `value_float`, `value_bool`, `value_date`), so attribute filters run on typed columns.
+    The unpivot writes the rows attribute by attribute, so row groups are pruned on it.
+    """
+    index_cols = [key_col, "data_provider_code", "secure_group_key"]
+    df = df.select(*index_cols, pl.col("extra_attributes").struct.unnest())
+    value = pl.col("value_string")
+    return (
+        df.with_columns(pl.exclude(index_cols).cast(pl.String))
+        .unpivot(index=index_cols, variable_name="attribute", value_name="value_string")
+        .filter(value.is_not_null())
+        .with_columns(
+            value_int=value.str.to_integer(strict=False),
+            value_float=value.cast(pl.Float64, strict=False),
+            value_bool=value.str.to_lowercase().replace_strict(
+                _BOOLEAN_VALUES, default=None, return_dtype=pl.Boolean
+            ),
+            value_date=value.str.to_date("%Y-%m-%d", strict=False),
+        )
+    )
+
+
+def _gold_attributes_processing(
+    context: dg.AssetExecutionContext,
+    assets: list[pl.LazyFrame],
+    key_col: str,
+    schema: dict[str, pl.DataType],
+) -> pl.LazyFrame:
+    data_provider_code = context.partition_key
+    # retailers without extra attributes (or other partitions' empty frames) add no rows
+    assets = [
+        df.filter(pl.col("data_provider_code") == data_provider_code)
+        for df in assets
+        if "extra_attributes" in df.collect_schema().names()
+    ]
+    df = pl.concat(
+        [
+            pl.LazyFrame(schema=schema),
+            *[extra_attributes_to_rows(df, key_col) for df in assets],
+        ],
+        how="diagonal_relaxed",
+    )
+    df = add_materialization_metadata(
+        context=context, df=df, count_rows=True, count_ids_in_col=key_col
+    )
+    return df
+
+
+def gold_prod_attributes_processing(
+    context: dg.AssetExecutionContext,
+    assets: list[pl.LazyFrame],
+) -> pl.LazyFrame:
+    return _gold_attributes_processing(
+        context, assets, key_col="prod_key", schema=gold_prod_attributes_pl_schema
+    )
+
+
+def gold_site_attributes_processing(
+    context: dg.AssetExecutionContext,
+    assets: list[pl.LazyFrame],
+) -> pl.LazyFrame:
+    return _gold_attributes_processing(
+        context, assets, key_col="site_key", schema=gold_site_attributes_pl_schema
+    )
+
+
 def gold_store_fact_processing(
     context: dg.AssetExecutionContext,
     assets: list[pl.LazyFrame],
     granularity: str,
 ) -> pl.LazyFrame:
-    try:
-        base_df = pl.scan_delta(f"data/gold/public/gold_store_{granularity}_fact.delta")
-    except Exception as e:
-        logger.warning(f"encountered {e}, creating empty gold from known schema")
-        base_df = pl.LazyFrame(schema=gold_store_fact_pl_schema)
     df = gold_generic_processing(
         context=context,
-        base_df=base_df,
         assets=assets,
         data_provider_code=context.partition_key,
+        schema=gold_store_fact_pl_schema,
     )
-    add_materialization_metadata(
+    df = add_materialization_metadata(
         context=context,
         df=df,
         count_dates_in_col="time_period_end_date",
         count_rows=False,
     )
+    narrow_merge_predicate(context=context, df=df)
     return df
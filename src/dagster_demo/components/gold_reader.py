@@ -0,0 +1,106 @@
+import polars as pl
+from collections.abc import Iterable
+from deltalake import DeltaTable
+from dagster_demo.components.dimension_cache import (
+    DEFAULT_DIMENSION_CACHE_MB,
+    VersionedFrameCache,
+)
+from dagster_demo.components.logger import logger
+
+# the gold IO manager writes assets to <root_uri>/public/<asset name>
+GOLD_TABLE_ROOT = "data/gold/public"
+# secure group key of retailers configured without one (see config_utils.py),
+# only read by callers passing `include_open_access=True`
+OPEN_ACCESS_SECURE_GROUP_KEY = 0
+
+# per secure group key results of gold reads, shared by the readers of the process
+gold_result_cache = VersionedFrameCache(budget_mb=DEFAULT_DIMENSION_CACHE_MB)
+
+
+def _data_provider_codes_for_secure_group_key(
+    table: DeltaTable, secure_group_key: int
+) -> list[str] | None:
+    """data_provider_code partitions with files that may hold `secure_group_key` rows,
+    from the partition values and min/max statistics of the delta log.
+    None, for no partition pruning, when the table is not partitioned by data_provider_code
+    or its files have no secure_group_key statistics."""
+    if "data_provider_code" not in table.metadata().partition_columns:
+        return None
+    files = pl.DataFrame(table.get_add_actions(flatten=True))
+    stats_cols = ["min.secure_group_key", "max.secure_group_key"]
+    if not set(stats_cols) <= set(files.columns):
+        return None
+    low, high = (pl.col(col) for col in stats_cols)
+    may_hold_key = (low <= secure_group_key) & (high >= secure_group_key)
+    return (
+        files.filter(may_hold_key | low.is_null() | high.is_null())
+        .get_column("partition.data_provider_code")
+        .unique()
+        .to_list()
+    )
+
+
+def read_gold(
+    table: str,
+    secure_group_keys: Iterable[int],
+    columns: list[str] | None = None,
+    root: str = GOLD_TABLE_ROOT,
+    storage_options: dict[str, str] | None = None,
+    include_open_access: bool = False,
+) -> pl.LazyFrame:
+    """Read the rows of gold `table` a caller with access to `secure_group_keys` may see.
+
+    Row level security is enforced with a secure_group_key predicate pushed into the delta
+    scan. Gold tables are partitioned by data_provider_code and every retailer writes a
+    single secure group key, so the partitions holding none of the keys are pruned from
+    the scan using the file statistics of the delta log.
+    Results are cached per secure group key and table version, a new gold version is read
+    again. Only the keys passed are read: rows of retailers configured without secure
+    group key (key 0) are read only with `include_open_access=True`.
+    """
+    table_uri = f"{root}/{table}"
+    secure_group_keys = set(secure_group_keys)
+    if include_open_access:
+        secure_group_keys.add(OPEN_ACCESS_SECURE_GROUP_KEY)
+    secure_group_keys = sorted(secure_group_keys)
+    if not secure_group_keys:
+        # no access, an empty frame with the table's schema
+        df = pl.scan_delta(table_uri, storage_options=storage_options)
+        return df.select(columns).clear() if columns else df.clear()
+    version = DeltaTable(
+        table_uri, storage_options=storage_options or None, without_files=True
+    ).version()
+    columns_key = tuple(columns) if columns else None
+
+    frames, missing_keys = [], []
+    for key in secure_group_keys:
+        df = gold_result_cache.get(table_uri, version, (key, columns_key))
+        if df is None:
+            missing_keys.append(key)
+        else:
+            frames.append(df)
+    if not missing_keys:
+        logger.info(f"Gold cache hit: {table_uri} v{version} {secure_group_keys}")
+        return pl.concat(frames).lazy()
+
+    delta_table = DeltaTable(
+        table_uri, version=version, storage_options=storage_options or None
+    )
+    # one scan per key, each reads the partitions of its key only
+    for key in missing_keys:
+        partitions = _data_provider_codes_for_secure_group_key(delta_table, key)
+        df = pl.scan_delta(delta_table)
+        if partitions is not None:
+            df = df.filter(pl.col("data_provider_code").is_in(partitions))
+        df = df.filter(pl.col("secure_group_key") == key)
+        if columns:
+            df = df.select(columns)
+        # keys without partitions are not scanned
+        df = df.clear().collect() if partitions == [] else df.collect()
+        logger.info(
+            f"Gold cache miss: {table_uri} v{version} {key}, "
+            f"scanned partitions {partitions if partitions is not None else 'all'}"
+        )
+        gold_result_cache.put(table_uri, version, (key, columns_key), df)
+        frames.append(df)
+    return pl.concat(frames).lazy()
@@ -0,0 +1,196 @@
+import dagster as dg
+import polars as pl
+from pathlib import Path
+from deltalake import DeltaTable
+from deltalake.exceptions import CommitFailedError, DeltaError
+from dagster_demo.components.change_data_feed import read_changes, table_version
+from dagster_demo.components.constants import KEY_DICTIONARY_ROOT
+from dagster_demo.components.dimension_cache import load_dimension
+from dagster_demo.components.logger import logger
+
+# natural key -> column holding its integer code in silver facts
+KEY_CODE_COLS: dict[str, str] = {"prod_id": "prod_code", "site_id": "site_code"}
+# merges of new codes, retried while concurrent writers take the same codes
+# (every attempt keeps the codes of at least one writer)
+_MAX_UPDATE_ATTEMPTS = 10
+
+
+def _key_dictionary_path(context: dg.AssetExecutionContext, natural_key: str) -> str:
+    # retailer id of the asset metadata, as used for the data provider code
+    ssid = next(
+        metadata["ssid"]
+        for metadata in context.assets_def.metadata_by_key.values()
+        if "ssid" in metadata
+    )
+    return f"{KEY_DICTIONARY_ROOT}/{ssid}/{natural_key}"
+
+
+def load_key_dictionary(
+    context: dg.AssetExecutionContext, natural_key: str, version: int | None = None
+) -> pl.DataFrame:
+    """Return the retailer's codes of `natural_key` (at `version`, the latest when None),
+    empty before its dim was first processed.
+    Read through the dimension cache, so a run reads an unchanged dictionary once."""
+    dictionary_path = _key_dictionary_path(context, natural_key)
+    if not (Path(dictionary_path) / "_delta_log").exists():
+        return pl.DataFrame(
+            schema={natural_key: pl.String(), KEY_CODE_COLS[natural_key]: pl.Int32()}
+        )
+    return load_dimension(dictionary_path, version=version)
+
+
+def _sql_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _release_colliding_codes(
+    dictionary_path: str, natural_key: str, new_keys: pl.DataFrame, snapshot: dict
+) -> int:
+    """Delete the `new_keys` rows whose code a concurrent writer assigned to another key.
+
+    Collisions are looked up in the freshly assigned code range only, a filter the file
+    statistics prune. A code taken by several keys is kept by the key committed first,
+    read from the change feed since the dictionary `snapshot` the codes were assigned
+    from, so exactly one writer keeps each code and the others retry with the next
+    free codes. Returns the rows deleted.
+    """
+    code_col = KEY_CODE_COLS[natural_key]
+    in_range = pl.col(code_col).is_between(
+        new_keys[code_col].min(), new_keys[code_col].max()
+    )
+    colliding = (
+        pl.scan_delta(dictionary_path)
+        .filter(in_range)
+        .filter(pl.col(natural_key).n_unique().over(code_col) > 1)
+        .join(new_keys.lazy(), on=[natural_key, code_col], how="semi")
+        .collect()
+    )
+    if colliding.is_empty():
+        return 0
+    changes = read_changes(DeltaTable(dictionary_path), snapshot)
+    if changes is not None:
+        # rows of files rewritten by later commits reappear in those commits' feed
+        first_commits = (
+            changes.filter(in_range)
+            .group_by(natural_key, code_col)
+            .agg(pl.col("_commit_version").min())
+        )
+        kept = first_commits.filter(
+            pl.col("_commit_version") == pl.col("_commit_version").min().over(code_col)
+        )
+        colliding = colliding.join(kept, on=[natural_key, code_col], how="anti")
+    # without the feed every writer releases its colliding codes, which leaves gaps
+    if colliding.is_empty():
+        return 0
+    rows = " OR ".join(
+        f"({natural_key} = {_sql_string(key)} AND {code_col} = {code})"
+        for key, code in colliding.select(natural_key, code_col).iter_rows()
+    )
+    DeltaTable(dictionary_path).delete(rows)
+    return colliding.height
+
+
+def update_key_dictionary(
+    context: dg.AssetExecutionContext, df: pl.LazyFrame, natural_key: str
+):
+    """Assign codes to the natural keys of `df` the retailer's dictionary does not hold yet.
+
+    Codes are dense and never reassigned: new keys get the next codes, in key order.
+    They are inserted with a merge on key equality, which skips keys the dictionary
+    already holds (an equi-join, unlike a predicate also matching codes). Concurrent
+    writers may then assign the same codes: the fresh code range is checked afterwards
+    and a writer whose codes were taken (or whose merge conflicts) re-reads the
+    dictionary and assigns the next free codes to its remaining keys.
+    """
+    code_col = KEY_CODE_COLS[natural_key]
+    dictionary_path = _key_dictionary_path(context, natural_key)
+    keys = df.select(natural_key).unique().collect()
+    try:
+        pl.DataFrame(
+            schema={natural_key: pl.String(), code_col: pl.Int32()}
+        ).write_delta(dictionary_path, mode="ignore")
+    except DeltaError:
+        # created by a concurrent writer
+        if not (Path(dictionary_path) / "_delta_log").exists():
+            raise
+    for _ in range(_MAX_UPDATE_ATTEMPTS):
+        # codes are assigned from, and merged into, this version: keys inserted
+        # concurrently fail the merge's conflict check instead of being skipped by it
+        table = DeltaTable(dictionary_path)
+        snapshot = table_version(table)
+        dictionary = load_key_dictionary(context, natural_key, snapshot["version"])
+        new_keys = keys.join(dictionary, on=natural_key, how="anti").sort(natural_key)
+        if new_keys.is_empty():
+            return
+        next_code = 0 if dictionary.is_empty() else dictionary[code_col].max() + 1
+        new_keys = new_keys.with_columns(
+            pl.int_range(next_code, next_code + new_keys.height, dtype=pl.Int32).alias(
+                code_col
+            )
+        )
+        try:
+            metrics = (
+                new_keys.write_delta(
+                    table,
+                    mode="merge",
+                    delta_merge_options={
+                        "predicate": f"s.{natural_key} = t.{natural_key}",
+                        "source_alias": "s",
+                        "target_alias": "t",
+                    },
+                )
+                .when_not_matched_insert_all()
+                .execute()
+            )
+        except CommitFailedError as e:
+            logger.info(f"Key dictionary {dictionary_path} changed concurrently ({e})")
+            continue
+        released = _release_colliding_codes(
+            dictionary_path, natural_key, new_keys, snapshot
+        )
+        if released:
+            logger.info(
+                f"Released {released} {natural_key} codes of {dictionary_path} "
+                "assigned concurrently to other keys"
+            )
+            continue
+        logger.info(
+            f"Added {metrics['num_target_rows_inserted']} {natural_key} codes "
+            f"to the key dictionary from code {next_code}"
+        )
+    keys_without_code = keys.join(
+        load_key_dictionary(context, natural_key), on=natural_key, how="anti"
+    )
+    if not keys_without_code.is_empty():
+        raise RuntimeError(
+            f"{keys_without_code.height} {natural_key} keys could not be added to "
+            f"{dictionary_path} after {_MAX_UPDATE_ATTEMPTS} attempts"
+        )
+
+
+def encode_natural_keys(
+    context: dg.AssetExecutionContext,
+    df: pl.LazyFrame,
+    natural_keys: list[str] = list(KEY_CODE_COLS),
+) -> pl.LazyFrame:
+    """Add the integer code of every natural key, null for keys missing from the dictionary.
+
+    Joins, sorts and group-bys on the codes avoid hashing and comparing variable length
+    strings, the natural keys are kept for the output.
+    """
+    for natural_key in natural_keys:
+        df = df.join(
+            load_key_dictionary(context, natural_key).lazy(),
+            on=natural_key,
+            how="left",
+        )
+    return df
+
+
+def series_cols(*dfs: pl.LazyFrame) -> list[str]:
+    """Columns identifying a (product, site) series: the codes when every frame has them.
+    Tables written before the codes were introduced fall back to the natural keys."""
+    code_cols = list(KEY_CODE_COLS.values())
+    if all(set(code_cols) <= set(df.collect_schema().names()) for df in dfs):
+        return code_cols
+    return list(KEY_CODE_COLS)
@@ -0,0 +1,105 @@
+import glob
+import os
+from collections import Counter
+from deltalake import DeltaTable
+from dagster_demo.components.logger import logger
+
+# fact tables are clustered on their lookup keys, so merges and reader filters skip files
+FACT_Z_ORDER_COLS = ["prod_id", "site_id", "time_period_end_date"]
+
+
+def find_delta_tables(roots: list[str]) -> list[str]:
+    """Return the delta tables under each `<root>/<schema>/<table>` of `roots`."""
+    return sorted(
+        os.path.dirname(os.path.normpath(delta_log))
+        for root in roots
+        for delta_log in glob.glob(f"{root}/*/*/_delta_log")
+    )
+
+
+def _files_per_partition(dt: DeltaTable) -> Counter:
+    """Count the files of each partition, keyed by its (column, value) pairs."""
+    add_actions = dt.get_add_actions(flatten=True)
+    partition_cols = dt.metadata().partition_columns
+    partition_values = zip(
+        *[add_actions.column(f"partition.{col}").to_pylist() for col in partition_cols]
+    )
+    if not partition_cols:  # the whole table is a single partition
+        partition_values = [()] * add_actions.num_rows
+    return Counter(tuple(zip(partition_cols, values)) for values in partition_values)
+
+
+def _table_stats(dt: DeltaTable) -> dict:
+    add_actions = dt.get_add_actions(flatten=True)
+    return {
+        "files": add_actions.num_rows,
+        "partitions": len(_files_per_partition(dt)) or 1,
+        "bytes": sum(add_actions.column("size_bytes").to_pylist()),
+    }
+
+
+def maintain_delta_table(
+    table_uri: str,
+    target_file_size_mb: int,
+    retention_hours: int,
+    z_order_cols: list[str] = FACT_Z_ORDER_COLS,
+) -> dict:
+    """Compact, checkpoint and vacuum a delta table. Returns before/after file statistics.
+
+    - Tables holding every `z_order_cols` column are Z-ordered on them, others are compacted.
+      Only partitions made of more than one file are rewritten, each with its own partition filter.
+    - A checkpoint is written and log entries older than the table's log retention are removed.
+    - Files no longer referenced for `retention_hours` are vacuumed.
+    """
+    dt = DeltaTable(table_uri)
+    before = _table_stats(dt)
+    target_size = target_file_size_mb * 1024 * 1024
+
+    table_cols = dt.schema().to_arrow().names
+    operation = (
+        "z_order" if all(col in table_cols for col in z_order_cols) else "compact"
+    )
+    # partitions already made of a single file are left untouched
+    fragmented_partitions = [
+        partition
+        for partition, num_files in _files_per_partition(dt).items()
+        if num_files > 1
+    ]
+    files_removed = 0
+    for partition in fragmented_partitions:
+        partition_filters = [(col, "=", str(value)) for col, value in partition] or None
+        if operation == "z_order":
+            optimize_stats = dt.optimize.z_order(
+                z_order_cols,
+                partition_filters=partition_filters,
+                target_size=target_size,
+            )
+        else:
+            optimize_stats = dt.optimize.compact(
+                partition_filters=partition_filters, target_size=target_size
+            )
+        files_removed += optimize_stats.get("numFilesRemoved", 0)
+
+    dt.create_checkpoint()
+    dt.cleanup_metadata()
+    vacuumed_files = dt.vacuum(retention_hours=retention_hours, dry_run=False)
+
+    dt = DeltaTable(table_uri)
+    after = _table_stats(dt)
+    logger.info(
+        f"Maintained {table_uri} ({operation} of {len(fragmented_partitions)} partitions): "
+        f"{before['files']} -> {after['files']} files, "
+        f"{len(vacuumed_files)} files vacuumed"
+    )
+    return {
+        "table_uri": table_uri,
+        "operation": operation,
+        "files_before": before["files"],
+        "files_after": after["files"],
+        "bytes_before": before["bytes"],
+        "bytes_after": after["bytes"],
+        "partitions_optimized": len(fragmented_partitions),
+        "files_removed_by_optimize": files_removed,
+        "files_vacuumed": len(vacuumed_files),
+        "table_version": dt.version(),
+    }
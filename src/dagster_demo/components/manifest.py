@@ -0,0 +1,132 @@
+import os
+import datetime as dt
+import dagster as dg
+import polars as pl
+from pathlib import Path
+from dagster_demo.components.constants import INGESTION_MANIFEST_ROOT
+from dagster_demo.components.logger import logger
+
+INGESTED_FILES_METADATA_KEY = "Ingested files"
+
+# a landing file is identified by its path, size and modification time,
+# so a retailer re-sending a corrected file under the same name is ingested again
+manifest_file_keys: list[str] = ["file_path", "file_size_bytes", "file_modified_ns"]
+
+manifest_pl_schema: dict[str, pl.DataType] = {
+    "file_path": pl.String(),
+    "file_size_bytes": pl.Int64(),
+    "file_modified_ns": pl.Int64(),
+    "ingested_at_utc_datetime": pl.Datetime(time_unit="us", time_zone="UTC"),
+    "run_id": pl.String(),
+}
+
+
+class LandingFilesConfig(dg.Config):
+    """Run config handed from a landing zone sensor to the bronze asset it triggers."""
+
+    file_paths: list[str] = []
+
+
+def _manifest_path(asset_name: str) -> str:
+    return f"{INGESTION_MANIFEST_ROOT}/{asset_name}"
+
+
+def load_ingestion_manifest(asset_name: str) -> pl.LazyFrame | None:
+    """Load the ingestion manifest of a bronze asset. Returns None before the first ingestion."""
+    manifest_path = _manifest_path(asset_name)
+    if not (Path(manifest_path) / "_delta_log").exists():
+        return None
+    return pl.scan_delta(manifest_path)
+
+
+def stat_landing_files(file_paths: list[str]) -> pl.DataFrame:
+    """Identify landing files by path, size and modification time."""
+    rows = []
+    for file_path in file_paths:
+        stat = os.stat(file_path)
+        rows.append(
+            {
+                "file_path": os.path.normpath(file_path),
+                "file_size_bytes": stat.st_size,
+                "file_modified_ns": stat.st_mtime_ns,
+            }
+        )
+    return pl.DataFrame(
+        rows, schema={col: manifest_pl_schema[col] for col in manifest_file_keys}
+    )
+
+
+def filter_ingested_files(asset_name: str, file_paths: list[str]) -> list[str]:
+    """Drop files that the ingestion manifest already records for this asset."""
+    candidates = stat_landing_files(file_paths)
+    manifest = load_ingestion_manifest(asset_name)
+    if manifest is not None:
+        candidates = (
+            candidates.lazy()
+            .join(
+                manifest.select(manifest_file_keys), on=manifest_file_keys, how="anti"
+            )
+            .collect()
+        )
+    return candidates["file_path"].to_list()
+
+
+def resolve_files_to_ingest(
+    context: dg.AssetExecutionContext, directory: str, config: LandingFilesConfig
+) -> list[str]:
+    """Return the landing files a bronze run should read.
+
+    Sensor-triggered runs receive the exact list of new files through `config`.
+    Runs launched without it (e.g. from the UI) fall back to every file in the directory.
+    Either way, files already recorded in the ingestion manifest are skipped,
+    so retries and duplicate run requests never append the same file twice.
+    """
+    file_paths = config.file_paths or [
+        entry.path for entry in os.scandir(directory) if entry.is_file()
+    ]
+    asset_name = context.asset_key.path[-1]
+    new_file_paths = filter_ingested_files(asset_name, file_paths)
+    skipped = len(file_paths) - len(new_file_paths)
+    if skipped:
+        logger.info(f"Skipping {skipped} files already in the {asset_name} manifest")
+    return new_file_paths
+
+
+def add_ingested_files_metadata(
+    context: dg.AssetExecutionContext, file_paths: list[str]
+):
+    """Attach the ingested files to the output so `record_ingestion_manifest` can persist them."""
+    context.add_output_metadata(
+        {
+            INGESTED_FILES_METADATA_KEY: dg.MetadataValue.json(
+                stat_landing_files(file_paths).to_dicts()
+            )
+        }
+    )
+
+
+@dg.success_hook
+def record_ingestion_manifest(context: dg.HookContext):
+    """Append the files of a successful bronze materialization to its ingestion manifest.
+
+    Runs after the IO manager committed the bronze append,
+    so a failed write never marks its files as ingested.
+    """
+    output_metadata = context.op_output_metadata.get("result") or {}
+    ingested_files = output_metadata.get(INGESTED_FILES_METADATA_KEY)
+    if ingested_files is None:
+        return
+    if isinstance(ingested_files, dg.MetadataValue):
+        ingested_files = ingested_files.value
+
+    manifest = pl.DataFrame(
+        ingested_files,
+        schema={col: manifest_pl_schema[col] for col in manifest_file_keys},
+    ).with_columns(
+        ingested_at_utc_datetime=dt.datetime.now(tz=dt.timezone.utc),
+        run_id=pl.lit(context.run_id),
+    )
+    manifest.write_delta(_manifest_path(context.op.name), mode="append")
+    context.log.info(
+        f"Recorded {manifest.height} files in the {context.op.name} ingestion manifest"
+    )
@@ -0,0 +1,76 @@
+import dagster as dg
+import datetime as dt
+import polars as pl
+from dagster_demo.components.logger import logger
+from dagster_demo.components.output_metadata import get_output_name
+from dagster_demo.components.streaming import get_execution_mode
+
+# target alias of the merge IO managers (see defs/resources/iomanagers.py)
+MERGE_TARGET_ALIAS = "t"
+# asset metadata key listing the physical partition columns of the delta table
+PARTITION_BY_METADATA_KEY = "partition_by"
+
+
+def add_time_period_end_month(df: pl.LazyFrame) -> pl.LazyFrame:
+    """Add the month of `time_period_end_date`, a low cardinality fact partition column."""
+    return df.with_columns(
+        time_period_end_month=pl.col("time_period_end_date").dt.month_start()
+    )
+
+
+def _sql_literal(value) -> str:
+    if isinstance(value, dt.date):
+        return f"DATE '{value.isoformat()}'"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+
+def narrow_merge_predicate(
+    context: dg.AssetExecutionContext,
+    df: pl.LazyFrame,
+    date_col: str = "time_period_end_date",
+    asset_key: dg.AssetKey | None = None,
+):
+    """Narrow the asset's `merge_predicate` to the date range and partition values of `df`.
+
+    Adds `t.<date_col>` bounds and `t.<partition col> IN (...)` for every `partition_by`
+    column of the asset metadata, so the merge only considers the target partitions and
+    files (by min/max statistics) the source batch can match. The narrowed predicate is
+    handed to the IO manager as runtime output metadata, which takes precedence over the
+    definition metadata. Nothing changes when `df` is empty.
+    Multi-assets pass the `asset_key` of the output `df` is written to.
+    """
+    metadata = context.assets_def.metadata_by_key[asset_key or context.asset_key]
+    merge_predicate = metadata["merge_predicate"]
+    partition_cols = metadata.get(PARTITION_BY_METADATA_KEY, [])
+
+    bounds = df.select(
+        pl.col(date_col).min().alias("min_date"),
+        pl.col(date_col).max().alias("max_date"),
+        *[pl.col(col).unique().implode() for col in partition_cols],
+    )
+    is_streaming = get_execution_mode(context, asset_key) == "streaming"
+    bounds = bounds.collect(engine="streaming" if is_streaming else "auto")
+    bounds = bounds.row(0, named=True)
+    if bounds["min_date"] is None:
+        return
+
+    conditions = [
+        merge_predicate,
+        f"{MERGE_TARGET_ALIAS}.{date_col} >= {_sql_literal(bounds['min_date'])}",
+        f"{MERGE_TARGET_ALIAS}.{date_col} <= {_sql_literal(bounds['max_date'])}",
+    ]
+    for col in partition_cols:
+        # IN never matches null partition values, leave those partitions unfiltered
+        if None in bounds[col]:
+            continue
+        values = ", ".join(_sql_literal(value) for value in sorted(bounds[col]))
+        conditions.append(f"{MERGE_TARGET_ALIAS}.{col} IN ({values})")
+    narrowed_predicate = " AND ".join(conditions)
+
+    logger.info(f"Narrowed merge predicate: {narrowed_predicate}")
+    context.add_output_metadata(
+        {"merge_predicate": dg.MetadataValue.text(narrowed_predicate)},
+        output_name=get_output_name(context, asset_key),
+    )
@@ -1,5 +1,15 @@
 import dagster as dg
 import polars as pl
+from dagster_demo.components.streaming import get_execution_mode, spill_to_parquet
+
+
+def get_output_name(
+    context: dg.AssetExecutionContext, asset_key: dg.AssetKey | None = None
+) -> str | None:
+    """Return the output name of `asset_key` in a multi-asset, None (the single output) otherwise."""
+    if asset_key is None:
+        return None
+    return context.assets_def.get_output_name_for_asset_key(asset_key)
 
 
 def add_materialization_metadata(
@@ -8,13 +18,42 @@ def add_materialization_metadata(
     count_dates_in_col: str = "",
     count_ids_in_col: str = "",
     count_rows: bool = True,
-):
+    asset_key: dg.AssetKey | None = None,
+) -> pl.LazyFrame:
+    """Execute `df` once and attach the requested metrics to the output.
+
+    All metrics are computed in a single aggregation over the collected result,
+    which is returned as a LazyFrame so the IO manager writes that same result
+    instead of executing the upstream plan again. Continue with the returned frame.
+
+    Assets in "streaming" execution mode are never collected in memory: the plan is
+    executed once on the streaming engine into a spill file (see `spill_to_parquet`),
+    the metrics are computed from it and the IO manager writes it in batches.
+
+    Multi-assets pass the `asset_key` of the output the metrics belong to.
+    """
+    is_streaming = get_execution_mode(context, asset_key) == "streaming"
+    df = spill_to_parquet(df) if is_streaming else df.collect()
+    metrics = []
     if count_dates_in_col:
-        num_dates = df.select(count_dates_in_col).unique().count().collect().item()
-        context.add_output_metadata({"Dates": dg.MetadataValue.int(num_dates)})
+        metrics.append(
+            pl.col(count_dates_in_col).drop_nulls().n_unique().alias("Dates")
+        )
     if count_ids_in_col:
-        num_ids = df.select(count_ids_in_col).unique().count().collect().item()
-        context.add_output_metadata({"Unique IDs": dg.MetadataValue.int(num_ids)})
+        metrics.append(
+            pl.col(count_ids_in_col).drop_nulls().n_unique().alias("Unique IDs")
+        )
     if count_rows:
-        num_rows = df.select(pl.len()).collect().item()
-        context.add_output_metadata({"Rows": dg.MetadataValue.int(num_rows)})
+        metrics.append(pl.len().alias("Rows"))
+    if metrics:
+        values = df.select(metrics)
+        if is_streaming:
+            values = values.collect(engine="streaming")
+        context.add_output_metadata(
+            {
+                name: dg.MetadataValue.int(value)
+                for name, value in values.row(0, named=True).items()
+            },
+            output_name=get_output_name(context, asset_key),
+        )
+    return df.lazy()
@@ -0,0 +1,81 @@
+import os
+import polars as pl
+from typing import Callable
+from dagster_demo.components.constants import PARTITION_INDEX_ROOT
+from dagster_demo.components.logger import logger
+from dagster_demo.components.state_files import read_state_file, write_state_file
+
+partition_index_pl_schema: dict[str, pl.DataType] = {
+    "file_path": pl.String(),
+    "partition_key": pl.String(),
+}
+
+
+def _partition_index_path(asset_name: str) -> str:
+    return f"{PARTITION_INDEX_ROOT}/{asset_name}.parquet"
+
+
+def load_partition_index(asset_name: str) -> pl.DataFrame:
+    """Load the persisted file -> partition key index of a partitioned bronze asset."""
+    return read_state_file(_partition_index_path(asset_name), partition_index_pl_schema)
+
+
+def index_partitions_in_files(
+    asset_name: str,
+    file_paths: list[str],
+    partition_col: str,
+    scan_files: Callable[..., pl.LazyFrame],
+) -> list[str]:
+    """Record which partition keys each new landing file contains and return the keys found.
+
+    `scan_files` is a polars scan function (e.g. `pl.scan_csv` with the retailer's options)
+    that accepts `include_file_paths`. Only `partition_col` is read, once per file at detection time.
+    Re-indexed files replace their previous entries, so a resent file never keeps stale keys.
+    """
+    if not file_paths:
+        return []
+    file_paths = [os.path.normpath(file_path) for file_path in file_paths]
+    new_entries = (
+        scan_files(file_paths, include_file_paths="_source_file")
+        .select(
+            pl.col("_source_file").alias("file_path"),
+            pl.col(partition_col).cast(pl.String).alias("partition_key"),
+        )
+        .unique()
+        .collect()
+    )
+    index = pl.concat(
+        [
+            load_partition_index(asset_name).filter(
+                ~pl.col("file_path").is_in(file_paths)
+            ),
+            new_entries,
+        ]
+    )
+    write_state_file(index, _partition_index_path(asset_name))
+
+    return new_entries["partition_key"].unique().sort().to_list()
+
+
+def files_containing_partitions(
+    asset_name: str, partition_keys: list[str]
+) -> dict[str, list[str]]:
+    """Return the indexed landing files that contain rows for each of `partition_keys`.
+    Keys missing from the index map to an empty list."""
+    index = load_partition_index(asset_name).filter(
+        pl.col("partition_key").is_in(partition_keys)
+    )
+    files_by_partition = {partition_key: [] for partition_key in partition_keys}
+    for partition_key, file_path in (
+        index.select("partition_key", "file_path")
+        .sort("partition_key", "file_path")
+        .iter_rows()
+    ):
+        # files removed from the landing zone since they were indexed are skipped
+        if os.path.exists(file_path):
+            files_by_partition[partition_key].append(file_path)
+    num_files = len(set().union(*files_by_partition.values()))
+    logger.info(
+        f"Partition index: {num_files} files contain partitions {partition_keys[0]}...{partition_keys[-1]}"
+    )
+    return files_by_partition
@@ -94,9 +94,14 @@ site_dim_required_cols: list[str] = [
     "valid_from",
 ]
 
+# point-in-time surrogate key lookup columns, facts read these instead of the whole dimension
+prod_dim_key_map_cols: list[str] = ["prod_id", "prod_key", "valid_from", "valid_to"]
+site_dim_key_map_cols: list[str] = ["site_id", "site_key", "valid_from", "valid_to"]
+
 store_fact_pl_schema: dict[str, pl.DataType] = {
     # Required columns
     "time_period_end_date": pl.Date(),
+    "time_period_end_month": pl.Date(),  # physical partition column
     "prod_id": pl.String(),
     "site_id": pl.String(),
     "created_at_utc_datetime": pl.Datetime(time_unit="us", time_zone="UTC"),
@@ -107,7 +112,11 @@ store_fact_pl_schema: dict[str, pl.DataType] = {
     # Surrogate keys from dimension tables
     "prod_key": pl.Int64(),
     "site_key": pl.Int64(),
+    # Retailer key dictionary codes of prod_id / site_id, silver only
+    "prod_code": pl.Int32(),
+    "site_code": pl.Int32(),
     # Nullable columns
+    "row_fingerprint": pl.Int64(),  # source bronze row, null in aggregated facts
     "pos_sales_units": pl.Int64(),
     "pos_sales_value_usd": pl.Float64(),
     "pos_sales_value_lc": pl.Float64(),
@@ -126,6 +135,9 @@ store_fact_pl_schema: dict[str, pl.DataType] = {
     "at_masked_pos_sales_value_lc": pl.Float64(),
 }
 
+# primary key of the store facts (the merge predicate columns)
+store_fact_key_cols: list[str] = ["time_period_end_date", "prod_id", "site_id"]
+
 store_fact_required_cols: list[str] = [
     "site_id",
     "prod_id",
@@ -152,11 +164,46 @@ gold_site_dim_pl_schema: dict[str, pl.DataType] = {
 }
 
 gold_store_fact_pl_schema: dict[str, pl.DataType] = {
-    **{k: v for k, v in store_fact_pl_schema.items() if k != "extra_attributes"},
+    **{
+        k: v
+        for k, v in store_fact_pl_schema.items()
+        if k not in ["extra_attributes", "prod_code", "site_code"]
+    },
     "extra_attributes": pl.String(),
 }
 
 
+# Gold attribute tables - extra_attributes unpivoted to one row per dim version
+# (surrogate key) and attribute, the value kept as string and cast to every type it parses as
+_gold_attributes_pl_schema: dict[str, pl.DataType] = {
+    "data_provider_code": pl.String(),
+    "secure_group_key": pl.Int32(),
+    "attribute": pl.String(),
+    "value_string": pl.String(),
+    "value_int": pl.Int64(),
+    "value_float": pl.Float64(),
+    "value_bool": pl.Boolean(),
+    "value_date": pl.Date(),
+}
+
+gold_prod_attributes_pl_schema: dict[str, pl.DataType] = {
+    "prod_key": pl.Int64(),
+    **_gold_attributes_pl_schema,
+}
+
+gold_site_attributes_pl_schema: dict[str, pl.DataType] = {
+    "site_key": pl.Int64(),
+    **_gold_attributes_pl_schema,
+}
+
+gold_attributes_required_cols: list[str] = [
+    "data_provider_code",
+    "secure_group_key",
+    "attribute",
+    "value_string",
+]
+
+
 def check_polars_schema(
     df_schema: pl.Schema, expected_schema: dict, required_cols_list: Iterable[str]
 ):
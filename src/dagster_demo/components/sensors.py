@@ -1,48 +1,237 @@
 import os
+import json
+import time
 import dagster as dg
+import polars as pl
+from dagster_demo.components.constants import (
+    ASSET_PARTITION_RANGE_END_TAG,
+    ASSET_PARTITION_RANGE_START_TAG,
+    LANDING_INDEX_ROOT,
+)
+from dagster_demo.components.logger import logger
+from dagster_demo.components.manifest import LandingFilesConfig
+from dagster_demo.components.state_files import read_state_file, write_state_file
 
 
-def detect_new_files_in_dir(
-    context: dg.SensorEvaluationContext, directory: str
+landing_index_pl_schema: dict[str, pl.DataType] = {
+    "file_path": pl.String(),
+    "file_size_bytes": pl.Int64(),
+    "file_modified_ns": pl.Int64(),
+    "file_inode": pl.UInt64(),
+    # generation of the sensor cursor that reported the file, null while not yet reported
+    "reported_generation": pl.Int64(),
+}
+
+_landing_file_cols = ["file_size_bytes", "file_modified_ns", "file_inode"]
+
+
+def _landing_index_path(directory: str) -> str:
+    index_name = os.path.normpath(directory).strip(os.sep).replace(os.sep, "_")
+    return f"{LANDING_INDEX_ROOT}/{index_name}.parquet"
+
+
+def _parse_landing_cursor(cursor: str | None) -> dict:
+    """Parse the scanner cursor. Cursors written by the former mtime-based
+    detection (a bare float) are kept as a cutoff for files reported before the index existed."""
+    parsed = json.loads(cursor) if cursor else {}
+    if not isinstance(parsed, dict):
+        parsed = {"legacy_modified_time": float(parsed)}
+    return {
+        "generation": 0,
+        "directory_modified_ns": None,
+        "full_scan_at": 0.0,
+        "has_pending_files": True,
+        "legacy_modified_time": None,
+        **parsed,
+    }
+
+
+def _load_landing_index(directory: str, committed_generation: int) -> pl.DataFrame:
+    """Load the persisted index of a landing directory.
+
+    Files reported by a tick whose cursor was never committed (failed evaluation)
+    are marked as unreported again, so they are handed out by the next tick.
+    """
+    index = read_state_file(_landing_index_path(directory), landing_index_pl_schema)
+    return index.with_columns(
+        reported_generation=pl.when(
+            pl.col("reported_generation") <= committed_generation
+        ).then(pl.col("reported_generation"))
+    )
+
+
+def _list_landing_files(directory: str) -> pl.DataFrame:
+    """Single os.scandir pass: file type and inode come from the directory entry, size and mtime from one stat."""
+    rows = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+            rows.append(
+                {
+                    "file_path": os.path.normpath(entry.path),
+                    "file_size_bytes": stat.st_size,
+                    "file_modified_ns": stat.st_mtime_ns,
+                    "file_inode": entry.inode(),
+                }
+            )
+    return pl.DataFrame(
+        rows,
+        schema={
+            col: dtype
+            for col, dtype in landing_index_pl_schema.items()
+            if col != "reported_generation"
+        },
+    )
+
+
+def scan_landing_directory(
+    context: dg.SensorEvaluationContext,
+    directory: str,
+    min_file_age_seconds: float = 0,
+    full_scan_interval_seconds: float = 3600,
 ) -> list[str]:
     """
-    Detect new files in a directory based on modification time.
-    Returns a list of absolute file paths for files that are newer than the cursor.
+    Detect new and changed files in a landing directory.
+
+    Keeps a persisted index of (path, size, mtime, inode) per directory and returns only deltas:
+    files that were not reported yet, or whose size, mtime or inode changed since they were reported.
+    A file is only reported once it is stable, i.e. unchanged since the previous scan
+    and at least `min_file_age_seconds` old, so partially written uploads are skipped until complete.
+
+    When the directory mtime is unchanged and no file is still settling, the listing is skipped entirely.
+    Files rewritten in place (which does not touch the directory mtime) are picked up
+    by a full scan every `full_scan_interval_seconds`.
     """
-    # find last modified date already processed
-    cursor_last_file_modification_time = float(context.cursor) if context.cursor else 0
-    new_file_paths = []
-    max_modification_time = cursor_last_file_modification_time
-
-    # First pass: collect all new files and find the maximum modification time
-    for filename in os.listdir(directory):
-        filepath = os.path.join(directory, filename)
-        if os.path.isfile(filepath):
-            last_modified = os.path.getmtime(filepath)
-            # only process fresh files
-            if last_modified > cursor_last_file_modification_time:
-                new_file_paths.append(filepath)
-                max_modification_time = max(max_modification_time, last_modified)
-
-    # Update the cursor to the newest file only after processing all files
-    if new_file_paths:
-        context.update_cursor(str(max_modification_time))
+    cursor = _parse_landing_cursor(context.cursor)
+    directory_modified_ns = os.stat(directory).st_mtime_ns
+    scan_time = time.time()
+    if (
+        cursor["directory_modified_ns"] == directory_modified_ns
+        and not cursor["has_pending_files"]
+        and scan_time - cursor["full_scan_at"] < full_scan_interval_seconds
+    ):
+        return []
+
+    generation = cursor["generation"] + 1
+    previous = _load_landing_index(directory, committed_generation=cursor["generation"])
+    current = _list_landing_files(directory)
 
+    is_unchanged = pl.all_horizontal(
+        [pl.col(col) == pl.col(f"{col}_previous") for col in _landing_file_cols]
+    ).fill_null(False)
+    is_old_enough = pl.col("file_modified_ns") <= int(
+        (scan_time - min_file_age_seconds) * 1e9
+    )
+    was_reported = is_unchanged & pl.col("reported_generation").is_not_null()
+    if cursor["legacy_modified_time"] is not None:
+        # same float conversion as os.path.getmtime, which produced the legacy cursor
+        modified_time = (pl.col("file_modified_ns") // 1_000_000_000).cast(
+            pl.Float64
+        ) + (pl.col("file_modified_ns") % 1_000_000_000).cast(pl.Float64) * 1e-9
+        was_reported = was_reported | (modified_time <= cursor["legacy_modified_time"])
+
+    index = (
+        current.join(previous, on="file_path", how="left", suffix="_previous")
+        .with_columns(
+            is_stable=is_unchanged & is_old_enough,
+            was_reported=was_reported,
+        )
+        .with_columns(
+            is_new=pl.col("is_stable") & ~pl.col("was_reported"),
+        )
+        .with_columns(
+            reported_generation=pl.when(pl.col("was_reported"))
+            .then(pl.col("reported_generation").fill_null(0))
+            .when(pl.col("is_new"))
+            .then(pl.lit(generation))
+        )
+    )
+    new_file_paths = index.filter("is_new")["file_path"].sort().to_list()
+
+    write_state_file(
+        index.select(landing_index_pl_schema.keys()), _landing_index_path(directory)
+    )
+    context.update_cursor(
+        json.dumps(
+            {
+                "generation": generation,
+                "directory_modified_ns": directory_modified_ns,
+                "full_scan_at": scan_time,
+                "has_pending_files": not index["is_stable"].all(),
+            }
+        )
+    )
     return new_file_paths
 
 
+def request_run_for_files(asset_name: str, file_paths: list[str]) -> dg.RunRequest:
+    """Hand the exact list of new landing files to the triggered bronze run,
+    so it reads only those instead of the whole landing directory."""
+    return dg.RunRequest(
+        run_config=dg.RunConfig(
+            ops={asset_name: LandingFilesConfig(file_paths=sorted(file_paths))}
+        ),
+    )
+
+
 def process_new_partitions_in_files(
-    partition_keys: list[str], asset_name: str
+    partition_keys: list[str],
+    asset_name: str,
+    partitions_def: dg.PartitionsDefinition | None = None,
+    max_partitions_per_run: int = 1,
 ) -> list[dg.RunRequest]:
-    """After calling `detect_new_files_in_dir`, the calling sensor can call this function to get a list of partition keys to target.
-    The sensor itself is responsible for parsing the files and supplying a list of partition keys."""
-    run_requests = []
+    """After calling `scan_landing_directory`, the calling sensor can call this function to get a list of partition keys to target.
+    The sensor itself is responsible for parsing the files and supplying a list of partition keys.
+
+    With `max_partitions_per_run` > 1, consecutive keys of `partitions_def` are grouped into
+    partition range runs of up to that many keys, so a backlog of dates is read and committed
+    in a few runs instead of one run per date. The asset needs a matching backfill policy.
+    Keys outside of `partitions_def` (e.g. dates before its start date) are logged and skipped."""
+    partition_keys = [str(key) for key in partition_keys]
+    if partitions_def is not None:
+        all_partition_keys = partitions_def.get_partition_keys()
+        position_by_key = {key: i for i, key in enumerate(all_partition_keys)}
+        unknown = sorted(key for key in partition_keys if key not in position_by_key)
+        if unknown:
+            logger.warning(
+                f"Skipping {len(unknown)} keys outside of the partitions definition of {asset_name}: {unknown}"
+            )
+        partition_keys = [key for key in partition_keys if key in position_by_key]
+
+    if max_partitions_per_run == 1:
+        return [
+            dg.RunRequest(
+                run_key=f"{asset_name}_{partition}",
+                partition_key=partition,
+            )
+            for partition in partition_keys
+        ]
 
-    for partition in partition_keys:
+    positions = sorted({position_by_key[key] for key in partition_keys})
+    ranges = []
+    for position in positions:
+        if (
+            ranges
+            and position == ranges[-1][-1] + 1
+            and len(ranges[-1]) < max_partitions_per_run
+        ):
+            ranges[-1].append(position)
+        else:
+            ranges.append([position])
+
+    run_requests = []
+    for partition_range in ranges:
+        start = all_partition_keys[partition_range[0]]
+        end = all_partition_keys[partition_range[-1]]
         run_requests.append(
             dg.RunRequest(
-                run_key=f"{asset_name}_{str(partition)}",
-                partition_key=str(partition),
+                run_key=f"{asset_name}_{start}...{end}",
+                tags={
+                    ASSET_PARTITION_RANGE_START_TAG: start,
+                    ASSET_PARTITION_RANGE_END_TAG: end,
+                },
             )
         )
 
@@ -2,11 +2,35 @@ import polars as pl
 import polars_hash as plh
 import polars.selectors as cs
 import dagster as dg
+from collections.abc import Iterator
 from typing import Literal
+from pathlib import Path
 from datetime import datetime, timezone
+from deltalake import DeltaTable
 from dagster_demo.components.logger import logger
 from dagster_demo.components.output_metadata import add_materialization_metadata
-from dagster_demo.components.bronze import add_ingestion_metadata
+from dagster_demo.components.merge_predicate import (
+    add_time_period_end_month,
+    narrow_merge_predicate,
+)
+from dagster_demo.components.change_data_feed import (
+    consumed_version_key,
+    read_changes,
+    table_version,
+)
+from dagster_demo.components.dimension_cache import load_dimension
+from dagster_demo.components.key_dictionary import (
+    KEY_CODE_COLS,
+    encode_natural_keys,
+    series_cols,
+    update_key_dictionary,
+)
+from dagster_demo.components.bronze import (
+    ROW_FINGERPRINT_COL,
+    add_ingestion_metadata,
+    add_row_fingerprint,
+)
+from dagster_demo.components.streaming import get_execution_mode, spill_to_parquet
 from dagster_demo.components.polars_schemas import (
     prod_dim_pl_schema,
     site_dim_pl_schema,
@@ -36,7 +60,8 @@ def _compute_scd_hash(
         logger.info(
             f"Auto-including {len(corp_cols)} corporate columns in SCD hash: {corp_cols}"
         )
-    all_scd_cols = set(scd_cols + corp_cols)
+    # sorted, so the hashed column order (and the keys) do not depend on the process
+    all_scd_cols = sorted(set(scd_cols + corp_cols))
 
     # Validate all SCD columns exist
     missing_cols = [col for col in all_scd_cols if col not in schema_names]
@@ -81,8 +106,15 @@ def _process_dimension_scd(
     When a tracked attribute changes,
     the old version is marked as expired and a new version is created.
     Old versions are detected through a natural key column.
+
+    Incoming rows are classified in a single lazy plan: rows whose surrogate key exists
+    are unchanged, the others are joined to the current versions on the natural key,
+    a match makes them an update of that version, no match a new natural key.
+    Only expired and new versions are returned, for the IO manager to upsert.
     """
     current_time = datetime.now(timezone.utc)
+    # New products get far-past date, updated products get current time
+    initial_valid_from = pl.lit(datetime(1900, 1, 1, tzinfo=timezone.utc))
 
     # Compute hash surrogate keys for new data
     incoming_dim, surrogate_key_column = _compute_scd_hash(
@@ -92,16 +124,13 @@ def _process_dimension_scd(
     # Initial load: mark all rows as current
     if existing_dim is None:
         logger.info(f"Initial {dim_table_name} load - marking all rows as current")
-        # For initial load, set valid_from to a date far in the past
-        initial_valid_from = pl.lit(datetime(1900, 1, 1, tzinfo=timezone.utc))
-
         result = incoming_dim.with_columns(
             is_current=pl.lit(True),
             valid_from=initial_valid_from,
             valid_to=pl.lit(None, dtype=pl.Datetime(time_unit="us", time_zone="UTC")),
         ).unique(subset=[surrogate_key_column])
 
-        add_materialization_metadata(
+        result = add_materialization_metadata(
             context=context,
             df=result,
             count_rows=False,
@@ -109,91 +138,99 @@ def _process_dimension_scd(
         )
         return result
 
-    # Find rows with new surrogate keys
-    new_rows = incoming_dim.join(
+    # Rows with a known surrogate key are unchanged, the rest are new or updated versions
+    changed_rows = incoming_dim.join(
         existing_dim.select([surrogate_key_column]), on=surrogate_key_column, how="anti"
+    ).join(
+        existing_dim.filter(pl.col("is_current"))
+        .select(natural_key, _replaced_key=pl.col(surrogate_key_column))
+        .unique(subset=[natural_key]),
+        on=natural_key,
+        how="left",
     )
 
-    # Stop early if no changes are detected
-    if new_rows.limit(1).collect().is_empty():
-        logger.info("No dimension changes detected - returning existing data")
-        add_materialization_metadata(
-            context=context,
-            df=existing_dim,
-            count_rows=False,
-            count_ids_in_col=surrogate_key_column,
-        )
-        return existing_dim
-
-    logger.info(
-        f"Detected {new_rows.select(pl.len()).collect().item()} dimension changes"
-    )
-
-    # Identify which natural keys are being updated (vs brand new)
-    current_versions = existing_dim.filter(pl.col("is_current") == True).select(  # noqa: E712
-        [
-            natural_key,
-            pl.col(surrogate_key_column),
-        ]
-    )
-
-    # Separate new rows into updates (existing natural key) vs truly new products
-    updated_natural_keys = (
-        new_rows.join(
-            current_versions.select(natural_key).unique(), on=natural_key, how="inner"
-        )
-        .select(natural_key)
-        .unique()
-    )
-
-    # Get the surrogate keys that need expiring
-    updated_keys = (
-        current_versions.join(updated_natural_keys, on=natural_key, how="inner")
-        .select(surrogate_key_column)
-        .unique()
-    )
-
-    # Expire old versions: set is_current=False and valid_to=now
+    # Expire the current versions being replaced: set is_current=False and valid_to=now
     expired_rows = existing_dim.join(
-        updated_keys, on=surrogate_key_column, how="inner"
+        changed_rows.select(
+            pl.col("_replaced_key").alias(surrogate_key_column)
+        ).drop_nulls(),
+        on=surrogate_key_column,
+        how="semi",
     ).with_columns(
         is_current=pl.lit(False),
         valid_to=pl.lit(current_time),
     )
 
-    # New products get far-past date, updated products get current time
-    initial_valid_from = pl.lit(datetime(1900, 1, 1, tzinfo=timezone.utc))
-
-    # Collect updated natural keys for the is_in check
-    updated_nk_list = (
-        updated_natural_keys.select(natural_key).collect().to_series().to_list()
+    new_versions = (
+        changed_rows.with_columns(
+            is_current=pl.lit(True),
+            # If natural_key had a current version, it's an update (use current_time)
+            # Otherwise it's a new product (use far-past date)
+            valid_from=pl.when(pl.col("_replaced_key").is_not_null())
+            .then(pl.lit(current_time))
+            .otherwise(initial_valid_from),
+            valid_to=pl.lit(None, dtype=pl.Datetime(time_unit="us", time_zone="UTC")),
+        )
+        .drop("_replaced_key")
+        .unique(subset=[surrogate_key_column])
     )
 
-    new_versions = new_rows.with_columns(
-        is_current=pl.lit(True),
-        # If natural_key exists in current_versions, it's an update (use current_time)
-        # Otherwise it's a new product (use far-past date)
-        valid_from=pl.when(pl.col(natural_key).is_in(updated_nk_list))
-        .then(pl.lit(current_time))
-        .otherwise(initial_valid_from),
-        valid_to=pl.lit(None, dtype=pl.Datetime(time_unit="us", time_zone="UTC")),
-    ).unique(subset=[surrogate_key_column])
-
     # Return only changed rows: expired versions + new versions
     # IO manager will upsert these based on surrogate key merge predicate
     result = pl.concat([expired_rows, new_versions], how="diagonal_relaxed")
 
-    add_materialization_metadata(
+    result = add_materialization_metadata(
         context=context,
         df=result,
         count_rows=False,
         count_ids_in_col=surrogate_key_column,
     )
-
+    # cheap on the frame materialized by add_materialization_metadata
+    changes = result.select(
+        expired=(~pl.col("is_current")).sum(), new_versions=pl.col("is_current").sum()
+    )
+    logger.info(
+        f"{dim_table_name} dimension changes: {changes.collect().row(0, named=True)}"
+    )
     return result
 
 
+def _join_version_intervals(
+    df: pl.LazyFrame, intervals: pl.LazyFrame, code_col: str, key_col: str
+) -> pl.LazyFrame:
+    """Join the dimension version of each fact row as of `_fact_ts`, without sorting the fact.
+
+    Every code's versions are turned into disjoint intervals covering the whole timeline:
+    before its first `valid_from` (no key), then from each `valid_from` to the next one.
+    An equi-join on the code followed by an interval filter keeps exactly one row per
+    fact row, the version a backward as-of join picks. Codes missing from the dimension
+    keep their fact rows with null keys.
+    """
+    versions = intervals.collect().sort(code_col, "valid_from")
+    versions = versions.with_columns(
+        _start=pl.col("valid_from"),
+        _end=pl.col("valid_from").shift(-1).over(code_col),
+    )
+    before_first = versions.group_by(code_col).agg(_end=pl.col("valid_from").min())
+    versions = pl.concat(
+        [
+            versions.select(code_col, key_col, "valid_to", "_start", "_end"),
+            before_first,
+        ],
+        how="diagonal_relaxed",
+    )
+    return (
+        df.join(versions.lazy(), on=code_col, how="left")
+        .filter(
+            (pl.col("_start").is_null() | (pl.col("_fact_ts") >= pl.col("_start")))
+            & (pl.col("_end").is_null() | (pl.col("_fact_ts") < pl.col("_end")))
+        )
+        .drop(["_start", "_end"])
+    )
+
+
 def _add_keys_to_fact(
+    context: dg.AssetExecutionContext,
     df: pl.LazyFrame,
     prod_dim: pl.LazyFrame,
     site_dim: pl.LazyFrame,
@@ -205,53 +242,86 @@ def _add_keys_to_fact(
     of the transaction, based on the fact date falling within the dimension's
     validity period (valid_from <= fact_date < valid_to, or valid_to is null).
 
+    Each fact row is resolved with a backward as-of join on the natural key code
+    (see `encode_natural_keys`), which picks
+    the latest version starting on or before the fact date, so the fact is never
+    multiplied by the dimension history. Rows without a valid version get a null key,
+    unmatched rows of both dimensions are counted in one aggregation over the result.
+
+    As-of joins need the fact sorted, which the streaming engine does in memory, so
+    "streaming" assets join each code's versions as disjoint intervals instead, from one
+    version's `valid_from` to the next one's, which pick the same version. Their plan is
+    returned unchecked: it is executed once by the caller, which counts unmatched rows
+    on the spilled result (see `_check_referential_integrity`).
+
     Returns:
         Fact table enriched with prod_key and site_key columns
     """
-    df_start_len = df.select(pl.len()).collect().item()
-    # Join product dimension on natural key and date range
-    df = (
-        df.join(
-            prod_dim.select(["prod_id", "prod_key", "valid_from", "valid_to"]),
-            on="prod_id",
-            how="inner",
-        )
-        .filter(
-            (pl.col(fact_date_col) >= pl.col("valid_from"))
-            & (
-                (pl.col("valid_to").is_null())
-                | (pl.col(fact_date_col) < pl.col("valid_to"))
-            )
+    is_streaming = get_execution_mode(context) == "streaming"
+    # the fact date is compared with the datetime validity columns
+    df = df.with_columns(
+        _fact_ts=pl.col(fact_date_col).cast(
+            pl.Datetime(time_unit="us", time_zone="UTC")
         )
-        .drop(["valid_from", "valid_to"])
     )
-    if df.select(pl.len()).collect().item() != df_start_len:
-        raise ValueError(
-            "Prod dim referential integrity error. Some fact rows are not present in dim."
+    if not is_streaming:
+        # as-of joins need both sides sorted on the join column
+        df = df.sort("_fact_ts")
+    for natural_key, key_col, dim in [
+        ("prod_id", "prod_key", prod_dim),
+        ("site_id", "site_key", site_dim),
+    ]:
+        code_col = KEY_CODE_COLS[natural_key]
+        intervals = dim.select([natural_key, key_col, "valid_from", "valid_to"])
+        intervals = (
+            encode_natural_keys(context, intervals, [natural_key])
+            .select([code_col, key_col, "valid_from", "valid_to"])
+            .sort("valid_from")
         )
+        if is_streaming:
+            df = _join_version_intervals(df, intervals, code_col, key_col)
+        else:
+            df = df.join_asof(
+                intervals,
+                left_on="_fact_ts",
+                right_on="valid_from",
+                by=code_col,
+                strategy="backward",
+                check_sortedness=False,  # sorted above, cannot be checked with `by`
+            ).drop("valid_from")
+        df = df.with_columns(
+            # the latest version may have expired before the fact date
+            pl.when(
+                pl.col("valid_to").is_null() | (pl.col("_fact_ts") < pl.col("valid_to"))
+            ).then(pl.col(key_col))
+        ).drop("valid_to")
+    df = df.drop("_fact_ts")
+
+    if is_streaming:
+        # checked by the caller on the result it spills, see `silver_fact_processing`
+        return df
+    df = df.collect()
+    _check_referential_integrity(df)
+    return df.lazy()
 
-    # Join site dimension on natural key and date range
-    df = (
-        df.join(
-            site_dim.select(["site_id", "site_key", "valid_from", "valid_to"]),
-            on="site_id",
-            how="inner",
-        )
-        .filter(
-            (pl.col(fact_date_col) >= pl.col("valid_from"))
-            & (
-                (pl.col("valid_to").is_null())
-                | (pl.col(fact_date_col) < pl.col("valid_to"))
-            )
-        )
-        .drop(["valid_from", "valid_to"])
+
+def _check_referential_integrity(df: pl.DataFrame | pl.LazyFrame):
+    """Raise when fact rows got no prod or site key, counted in one aggregation.
+    LazyFrames (spilled streaming results) are aggregated on the streaming engine."""
+    unmatched = df.select(
+        prod=pl.col("prod_key").null_count(), site=pl.col("site_key").null_count()
     )
-    if df.select(pl.len()).collect().item() != df_start_len:
+    if isinstance(unmatched, pl.LazyFrame):
+        unmatched = unmatched.collect(engine="streaming")
+    unmatched = unmatched.row(0, named=True)
+    if unmatched["prod"]:
         raise ValueError(
-            "Site dim referential integrity error. Some fact rows are not present in dim."
+            f"Prod dim referential integrity error. {unmatched['prod']} fact rows are not present in dim."
+        )
+    if unmatched["site"]:
+        raise ValueError(
+            f"Site dim referential integrity error. {unmatched['site']} fact rows are not present in dim."
         )
-
-    return df
 
 
 def _prefix_cols(df: pl.LazyFrame, prefix: str, exclude: list[str] = []):
@@ -276,6 +346,7 @@ def _apply_antitrust_masking(
     df: pl.LazyFrame,
     mask_selection: Literal["value", "volume"],
     granularity: Literal["daily", "weekly", "monthly"],
+    history: pl.LazyFrame | None = None,
 ) -> pl.LazyFrame:
     """Apply moving average antitrust masking to specified columns.
 
@@ -288,9 +359,15 @@ def _apply_antitrust_masking(
             - 'daily': 7-day moving average
             - 'weekly': 4-week moving average
             - 'monthly': 3-month moving average
+        history: Already processed rows of the same fact, when `df` is an incremental batch.
+            For every (prod, site) series in `df`, the window_size - 1 periods preceding its
+            first new period (and any later rows, restated by late arriving periods) are read
+            from it, so only the affected windows are computed. Series missing periods within
+            that range get fewer preceding values than a full recomputation would use.
 
     Returns:
-        DataFrame with additional at_masked_{column} columns
+        DataFrame with additional at_masked_{column} columns. With `history`,
+        also the restated history rows following the first new period of their series.
     """
     # Define window sizes based on granularity (in number of periods)
     window_config = {
@@ -298,6 +375,11 @@ def _apply_antitrust_masking(
         "weekly": 4,
         "monthly": 3,
     }
+    period_config = {
+        "daily": "d",
+        "weekly": "w",
+        "monthly": "mo",
+    }
 
     if granularity not in window_config:
         raise ValueError(
@@ -332,16 +414,54 @@ def _apply_antitrust_masking(
         f"Applying {mask_selection} antitrust masking to {columns_to_mask} with {window_size}-period window"
     )
 
+    # integer key codes when available, natural keys for tables predating them
+    series_keys = series_cols(df) if history is None else series_cols(df, history)
+    affected_series = None
+    if history is not None:
+        # first new period of every series in the batch, and the start of its first window
+        affected_series = (
+            df.group_by(series_keys)
+            .agg(_first_new_date=pl.col("time_period_end_date").min())
+            .with_columns(
+                _window_start=pl.col("_first_new_date").dt.offset_by(
+                    f"-{window_size - 1}{period_config[granularity]}"
+                )
+            )
+            .collect()
+        )
+    if affected_series is not None and not affected_series.is_empty():
+        history_cols = history.collect_schema().names()
+        preceding_rows = (
+            # literal bound first, so partitions and files before every window are skipped
+            history.filter(
+                pl.col("time_period_end_date") >= affected_series["_window_start"].min()
+            )
+            .join(affected_series.lazy(), on=series_keys, how="inner")
+            .filter(pl.col("time_period_end_date") >= pl.col("_window_start"))
+            # periods restated by the batch
+            .join(
+                df.select([*series_keys, "time_period_end_date"]),
+                on=[*series_keys, "time_period_end_date"],
+                how="anti",
+            )
+            .select([col for col in schema.names() if col in history_cols])
+        )
+        df = pl.concat([df, preceding_rows], how="diagonal_relaxed")
+        logger.info(
+            f"Incremental masking of {affected_series.height} series "
+            f"from {affected_series['_window_start'].min()}"
+        )
+
     # Apply moving average to each column
-    # Group by prod_id and site_id to calculate moving averages within each product-site combination
-    df = df.sort(["prod_id", "site_id", "time_period_end_date"])
+    # Group by product and site to calculate moving averages within each product-site combination
+    df = df.sort([*series_keys, "time_period_end_date"])
     masked_exprs = []
     for col in columns_to_mask:
         masked_col_name = f"at_masked_{col}"
         expr = (
             pl.col(col)
             .rolling_mean(window_size=window_size)
-            .over(["prod_id", "site_id"])
+            .over(series_keys)
             .alias(masked_col_name)
         )
         if mask_selection == "volume":
@@ -351,17 +471,42 @@ def _apply_antitrust_masking(
 
     df = df.with_columns(masked_exprs)
 
-    return df
+    if affected_series is not None and not affected_series.is_empty():
+        # rows before the first new period only fed the windows, their masks are unchanged
+        df = (
+            df.join(
+                affected_series.lazy().select([*series_keys, "_first_new_date"]),
+                on=series_keys,
+            )
+            .filter(pl.col("time_period_end_date") >= pl.col("_first_new_date"))
+            .drop("_first_new_date")
+        )
 
+    return df
 
-def _load_product_master_data():
-    df = pl.scan_parquet("faker/data/corporate_product_master_data.parquet")
-    return _prefix_cols(df, prefix="corp")
 
+def corporate_master_data_processing(
+    context: dg.AssetExecutionContext, df: pl.LazyFrame, join_key: str
+) -> dg.Output[pl.LazyFrame]:
+    """Publish corporate master data as a lookup table for the dimension joins.
 
-def _load_site_master_data():
-    df = pl.scan_parquet("faker/data/corporate_site_master_data.parquet")
-    return _prefix_cols(df, prefix="corp")
+    Columns get the `corp_` prefix, and rows are deduplicated on `join_key` and sorted by it,
+    so the dimension joins never multiply rows and the table's file statistics prune on the key.
+    The data version is a fingerprint of the content (sum of row hashes, independent of row order).
+    """
+    df = _prefix_cols(df, prefix="corp")
+    df = (
+        df.filter(pl.col(join_key).is_not_null())
+        .unique(subset=[join_key], keep="first", maintain_order=True)
+        .sort(join_key)
+    )
+    df = add_materialization_metadata(
+        context=context, df=df, count_rows=False, count_ids_in_col=join_key
+    )
+    version = add_row_fingerprint(df).select(pl.col(ROW_FINGERPRINT_COL).sum())
+    version = f"{version.collect().item() & 0xFFFFFFFFFFFFFFFF:016x}"
+    logger.info(f"Corporate master data version {version}")
+    return dg.Output(df, data_version=dg.DataVersion(version))
 
 
 def column_name_is_in_data_model(table: str, col_name) -> bool:
@@ -379,6 +524,147 @@ def column_name_is_in_data_model(table: str, col_name) -> bool:
             raise NotImplementedError("This table is not yet supported for validation.")
 
 
+class SilverFactConfig(dg.Config):
+    # reprocess the whole upstream history instead of the upstream versions not read yet
+    full_rebuild: bool = False
+
+
+def _get_consumed_version(
+    context: dg.AssetExecutionContext,
+    upstream_key: dg.AssetKey,
+    asset_key: dg.AssetKey | None = None,
+) -> dict | None:
+    """Return the `upstream_key` table version read by the asset's last materialization.
+
+    Returns None (full rebuild) when the silver table does not exist,
+    e.g. it was dropped, or no materialization recorded a version yet.
+    """
+    asset_key = asset_key or context.asset_key
+    if not (Path(_silver_table_path(context, asset_key)) / "_delta_log").exists():
+        return None
+    event = context.instance.get_latest_materialization_event(asset_key)
+    if event is None or event.asset_materialization is None:
+        return None
+    consumed = event.asset_materialization.metadata.get(
+        consumed_version_key(upstream_key)
+    )
+    return consumed.value if consumed is not None else None
+
+
+def _record_load(
+    context: dg.AssetExecutionContext,
+    is_incremental: bool,
+    upstream_key: dg.AssetKey,
+    version: dict,
+    output_name: str | None = None,
+):
+    """Record the load mode and the upstream table version read."""
+    context.add_output_metadata(
+        {
+            "Load mode": dg.MetadataValue.text(
+                "incremental" if is_incremental else "full rebuild"
+            ),
+            consumed_version_key(upstream_key): dg.MetadataValue.json(version),
+        },
+        output_name=output_name,
+    )
+
+
+def _load_silver_table(
+    context: dg.AssetExecutionContext, asset_key: dg.AssetKey | None = None
+) -> pl.LazyFrame | None:
+    """Scan the asset's own silver table. None when it does not exist yet."""
+    delta_path = _silver_table_path(context, asset_key)
+    if not (Path(delta_path) / "_delta_log").exists():
+        return None
+    return pl.scan_delta(delta_path)
+
+
+def _load_silver_fingerprints(context: dg.AssetExecutionContext) -> pl.LazyFrame | None:
+    """Return the bronze row fingerprints held by the asset's silver table.
+    None when the table does not exist or predates fingerprinting."""
+    silver = _load_silver_table(context)
+    if silver is None or ROW_FINGERPRINT_COL not in silver.collect_schema().names():
+        return None
+    return silver.select(ROW_FINGERPRINT_COL).drop_nulls()
+
+
+def _bronze_table_path(asset_key: dg.AssetKey) -> str:
+    # same layout as `_silver_table_path`, under the bronze IO manager root
+    return f"data/bronze/public/{asset_key.path[-1]}"
+
+
+def select_new_bronze_rows(
+    context: dg.AssetExecutionContext,
+    df: pl.LazyFrame,
+    input_name: str,
+    full_rebuild: bool = False,
+) -> pl.LazyFrame:
+    """Keep the bronze rows appended after the bronze version the asset last read
+    and record the version read.
+
+    Bronze is append-only, so the rows of the commits after the last consumed table
+    version are exactly the unprocessed appends, whatever `created_at_utc_datetime`
+    concurrent bronze runs stamped them with. They are read from the table's change feed.
+    Of those, rows whose `row_fingerprint` silver already holds were re-sent unchanged
+    and are dropped with an anti-join on the fingerprint column alone.
+    The version is stored in the output metadata, so it only moves once the write succeeds.
+
+    Args:
+        df (pl.LazyFrame): the bronze input, before the retailer's mapping
+        input_name (str): name of the bronze input of the asset
+        full_rebuild (bool): read the whole bronze history
+    """
+    bronze_key = context.asset_key_for_input(input_name)
+    # opened once, so the rows read and the version recorded are the same snapshot
+    bronze = DeltaTable(_bronze_table_path(bronze_key))
+    consumed = None if full_rebuild else _get_consumed_version(context, bronze_key)
+    changes = None if consumed is None else read_changes(bronze, consumed)
+    if changes is not None:
+        df = changes.lazy().select(df.collect_schema().names())
+        silver_fingerprints = _load_silver_fingerprints(context)
+        if silver_fingerprints is not None:
+            df = df.join(silver_fingerprints, on=ROW_FINGERPRINT_COL, how="anti")
+        logger.info(
+            f"Incremental load of bronze rows appended after version {consumed['version']}"
+        )
+    else:
+        df = pl.scan_delta(bronze).select(df.collect_schema().names())
+        logger.info("Full rebuild from the whole bronze history")
+
+    _record_load(
+        context=context,
+        is_incremental=changes is not None,
+        upstream_key=bronze_key,
+        version=table_version(bronze),
+    )
+    return df
+
+
+def _select_affected_buckets(
+    changed_rows: pl.DataFrame,
+    series_keys: list[str],
+    sampling_period: Literal["1w", "1mo"],
+    consumed_version: int,
+) -> pl.DataFrame:
+    """Return the buckets of the day fact rows upserted after `consumed_version`.
+
+    A bucket is a (prod, site, period) aggregate, the series identified by `series_keys`.
+    Every day fact row upserted after the last run, late arriving days and full rebuilds
+    included, is in a later commit of the day fact, so re-aggregating the buckets of
+    those rows restates exactly the aggregates that changed.
+    """
+    return (
+        changed_rows.filter(pl.col("_commit_version") > consumed_version)
+        .select(
+            *series_keys,
+            # group_by_dynamic windows start at the date truncated to the sampling period
+            _bucket_start=pl.col("time_period_end_date").dt.truncate(sampling_period),
+        )
+        .unique()
+    )
+
+
 def silver_fact_processing(
     context: dg.AssetExecutionContext,
     df: pl.LazyFrame,
@@ -386,8 +672,28 @@ def silver_fact_processing(
     site_dim: pl.LazyFrame,
     granularity: Literal["daily", "weekly", "monthly"],
     antitrust_masking_selection: Literal["value", "volume"] | None = None,
+    full_rebuild: bool = False,
 ):
-    df = df.unique()  # deduplication of bronze data
+    """Build a silver fact from the bronze rows not processed yet.
+
+    `df` is the retailer mapping of the rows returned by `select_new_bronze_rows`,
+    i.e. the rows appended to bronze after the version the asset last read.
+    Pass `full_rebuild=True` (run config `full_rebuild: true`) to reprocess the whole
+    bronze history, e.g. after changing the mapping. A dropped silver table is rebuilt
+    in full automatically. Incremental loads of masked assets read the preceding periods
+    of the affected series back from the silver table (see `_apply_antitrust_masking`).
+    """
+    is_streaming = get_execution_mode(context) == "streaming"
+    # deduplication of bronze data on the row fingerprint,
+    # rows ingested before fingerprinting are deduplicated on every column
+    df = pl.concat(
+        [
+            df.filter(pl.col(ROW_FINGERPRINT_COL).is_not_null()).unique(
+                subset=[ROW_FINGERPRINT_COL]
+            ),
+            df.filter(pl.col(ROW_FINGERPRINT_COL).is_null()).unique(),
+        ]
+    )
 
     # Apply global ID transformation: concatenate data_provider_code with natural keys
     df = df.with_columns(
@@ -399,8 +705,16 @@ def silver_fact_processing(
         ),
     )
 
+    # dims written before the key dictionary existed hold keys without codes,
+    # their keys are backfilled here (a no-op once the dictionary holds every dim key)
+    update_key_dictionary(context=context, df=prod_dim, natural_key="prod_id")
+    update_key_dictionary(context=context, df=site_dim, natural_key="site_id")
+    # integer codes of the natural keys, used by the joins, sorts and group-bys below
+    df = encode_natural_keys(context, df)
+
     # Add surrogate keys from dimension tables using point-in-time logic
     df = _add_keys_to_fact(
+        context=context,
         df=df,
         prod_dim=prod_dim,
         site_dim=site_dim,
@@ -409,19 +723,39 @@ def silver_fact_processing(
 
     # Apply antitrust masking if columns are specified
     if antitrust_masking_selection:
+        if is_streaming:
+            # masking reads the keyed fact twice (affected series, then the windows)
+            df = spill_to_parquet(df)
         df = _apply_antitrust_masking(
             df=df,
             mask_selection=antitrust_masking_selection,
             granularity=granularity,
+            history=None if full_rebuild else _load_silver_table(context),
         )
 
-    add_materialization_metadata(
+    df = add_time_period_end_month(df)
+    df = add_materialization_metadata(
         context=context, df=df, count_dates_in_col="time_period_end_date"
     )
+    if is_streaming:
+        # on the result spilled by add_materialization_metadata
+        _check_referential_integrity(df)
+    narrow_merge_predicate(context=context, df=df)
     return df
 
 
 # TODO: figure out more elegant way to support local to cloud transition
+def _silver_table_path(
+    context: dg.AssetExecutionContext, asset_key: dg.AssetKey | None = None
+) -> str:
+    # Build path where IO manager writes: root_uri/namespace/asset_name
+    root_uri = "data/silver"
+    asset_key = asset_key or context.asset_key
+    asset_name = asset_key.path[-1]  # e.g., "carretwo_fr_silver_prod_dim"
+    namespace = "public"  # Default namespace
+    return f"{root_uri}/{namespace}/{asset_name}"
+
+
 def _load_existing_dimension(
     context: dg.AssetExecutionContext, dim_type: str
 ) -> pl.LazyFrame | None:
@@ -430,22 +764,16 @@ def _load_existing_dimension(
     Uses the asset's IO manager configuration to determine the storage path.
     Returns None if the table doesn't exist yet (initial load).
     """
-    # Build path where IO manager writes: root_uri/namespace/asset_name
-    root_uri = "data/silver"
-    asset_name = context.asset_key.path[-1]  # e.g., "carretwo_fr_silver_prod_dim"
-    namespace = "public"  # Default namespace
-    delta_path = f"{root_uri}/{namespace}/{asset_name}"
+    delta_path = _silver_table_path(context)
 
     try:
         # Check if Delta table exists by looking for _delta_log
-        from pathlib import Path
-
         delta_log_path = Path(delta_path) / "_delta_log"
         if not delta_log_path.exists():
             logger.info(f"No {dim_type} dimension table at {delta_path} (initial load)")
             return None
 
-        existing_dim = pl.scan_delta(delta_path)
+        existing_dim = load_dimension(delta_path).lazy()
         logger.info(f"Loaded existing {dim_type} dimension from {delta_path}")
         return existing_dim
     except Exception as e:
@@ -459,6 +787,7 @@ def silver_prod_dim_processing(
     context: dg.AssetExecutionContext,
     incoming_dim: pl.LazyFrame,
     scd_cols: list[str],
+    corporate_master_data: pl.LazyFrame | None = None,
 ):
     # Load existing dimension data for SCD processing
     existing_dim = _load_existing_dimension(context, dim_type="product")
@@ -466,11 +795,13 @@ def silver_prod_dim_processing(
     df = incoming_dim.unique(subset=["prod_id"])
     df = _prefix_cols(df, prefix="source", exclude=["extra_attributes"])
 
-    if "source_item_gtin" in df.collect_schema().names():
+    if (
+        corporate_master_data is not None
+        and "source_item_gtin" in df.collect_schema().names()
+    ):
         logger.info("Joining with corporate product master on GTIN.")
-        master = _load_product_master_data()
         df = df.join(
-            master,
+            corporate_master_data,
             left_on="source_item_gtin",
             right_on="corp_item_gtin",
             how="left",
@@ -485,6 +816,7 @@ def silver_prod_dim_processing(
             pl.col("data_provider_code").str.strip_chars_start("cds_"), "prod_id"
         )
     )
+    update_key_dictionary(context=context, df=df, natural_key="prod_id")
 
     # Apply SCD Type 2 processing
     df = _process_dimension_scd(
@@ -503,6 +835,7 @@ def silver_site_dim_processing(
     context: dg.AssetExecutionContext,
     incoming_dim: pl.LazyFrame,
     scd_cols: list[str],
+    corporate_master_data: pl.LazyFrame | None = None,
 ):
     # Load existing dimension data for SCD processing
     existing_dim = _load_existing_dimension(context, dim_type="site")
@@ -510,10 +843,12 @@ def silver_site_dim_processing(
     df = incoming_dim.unique(subset=["site_id"])
     df = _prefix_cols(df, prefix="source", exclude=["extra_attributes"])
 
-    if "source_global_location_number" in df.collect_schema().names():
-        master = _load_site_master_data()
+    if (
+        corporate_master_data is not None
+        and "source_global_location_number" in df.collect_schema().names()
+    ):
         df = df.join(
-            master,
+            corporate_master_data,
             left_on="source_global_location_number",
             right_on="corp_global_location_number",
             how="left",
@@ -528,6 +863,7 @@ def silver_site_dim_processing(
             pl.col("data_provider_code").str.strip_chars_start("cds_"), "site_id"
         )
     )
+    update_key_dictionary(context=context, df=df, natural_key="site_id")
 
     # Apply SCD Type 2 processing
     df = _process_dimension_scd(
@@ -542,23 +878,31 @@ def silver_site_dim_processing(
     return df
 
 
-def silver_fact_downsample(
+def silver_fact_rollup(
     context: dg.AssetExecutionContext,
     df: pl.LazyFrame,
-    sampling_period: Literal["1w", "1mo"],
-):
-    """Return a dataframe with aggregate granularity.
+    sampling_periods: dict[str, Literal["1w", "1mo"]],
+    full_rebuild: bool = False,
+) -> Iterator[dg.Output]:
+    """Downsample a day fact to several aggregate granularities from one shared read.
+
+    The day rows needed by every selected output are read and sorted once, each
+    output then aggregates its buckets from that sorted frame. Only the buckets
+    touched by day fact rows upserted since an output's last run are re-aggregated
+    and emitted (see `_select_affected_buckets`), so only their date range is read.
 
     Args:
         df (pl.LazyFrame): more granular dataframe
-        sampling_period ("1w" OR "1mo"): aggregation level for dates
+        sampling_periods (dict): output name of the multi-asset -> sampling period
+            ("1w" OR "1mo"). A new granularity needs a masking window in
+            `_apply_antitrust_masking`.
+        full_rebuild (bool): re-aggregate the whole day fact history
     """
     # Determine granularity for antitrust masking based on sampling period
     granularity_map: dict[str, Literal["daily", "weekly", "monthly"]] = {
         "1w": "weekly",
         "1mo": "monthly",
     }
-    granularity = granularity_map[sampling_period]
 
     # Identify antitrust masked columns in the input dataframe
     schema = df.collect_schema()
@@ -575,31 +919,146 @@ def silver_fact_downsample(
         ):
             mask_selection = "value"
 
-    # group_by_dynamic requires sorted input on the index column
-    df = df.sort(["prod_id", "site_id", "time_period_end_date"])
+    # outputs not selected for this run are left untouched
+    sampling_periods = {
+        output_name: sampling_period
+        for output_name, sampling_period in sampling_periods.items()
+        if output_name in context.selected_output_names
+    }
+    (day_fact_key,) = context.assets_def.keys_by_input_name.values()
+    # opened once, so the rows read and the version recorded are the same snapshot
+    day_fact = DeltaTable(_silver_table_path(context, day_fact_key))
+    version = table_version(day_fact)
+    df = pl.scan_delta(day_fact).select(df.collect_schema().names())
+    consumed_versions = {
+        output_name: None
+        if full_rebuild
+        else _get_consumed_version(
+            context, day_fact_key, context.asset_key_for_output(output_name)
+        )
+        for output_name in sampling_periods
+    }
+    # integer key codes when available, natural keys for tables predating them
+    series_keys = series_cols(df)
+    # natural keys (and the data provider) are constant per series, carried through the aggregation
+    carried_cols = [
+        col
+        for col in ["prod_id", "site_id", "data_provider_code"]
+        if col not in series_keys
+    ]
 
-    df = df.group_by_dynamic(
-        index_column="time_period_end_date",
-        group_by=["prod_id", "site_id", "data_provider_code"],
-        every=sampling_period,
-        label="right",
-    ).agg(
-        cs.numeric().sum(),
-    )
-    df = add_ingestion_metadata(df=df, data_source="aggregation")
+    affected_buckets: dict[str, pl.DataFrame] = {}
+    changed_rows = None
+    if all(consumed is not None for consumed in consumed_versions.values()):
+        oldest_consumed = min(
+            consumed_versions.values(), key=lambda consumed: consumed["version"]
+        )
+        changed_rows = read_changes(day_fact, oldest_consumed)
+    if changed_rows is not None:
+        changed_rows = changed_rows.select(
+            *series_keys, "time_period_end_date", "_commit_version"
+        )
+        for output_name, sampling_period in sampling_periods.items():
+            consumed_version = consumed_versions[output_name]["version"]
+            affected_buckets[output_name] = _select_affected_buckets(
+                changed_rows=changed_rows,
+                series_keys=series_keys,
+                sampling_period=sampling_period,
+                consumed_version=consumed_version,
+            )
+            logger.info(
+                f"Incremental downsampling of {affected_buckets[output_name].height} "
+                f"{sampling_period} buckets changed after version {consumed_version}"
+            )
+        affected_series = changed_rows.select(series_keys).unique()
+        bucket_ranges = [
+            (
+                buckets["_bucket_start"].min(),
+                buckets.select(
+                    pl.col("_bucket_start")
+                    .max()
+                    .dt.offset_by(sampling_periods[output_name])
+                ).item(),
+            )
+            for output_name, buckets in affected_buckets.items()
+            if not buckets.is_empty()
+        ]
+        if bucket_ranges:
+            first_day = min(start for start, _ in bucket_ranges)
+            end_day = max(end for _, end in bucket_ranges)
+            df = (
+                # literal date range first, so partitions and files outside the buckets are skipped
+                df.filter(
+                    pl.col("time_period_end_date") >= first_day,
+                    pl.col("time_period_end_date") < end_day,
+                ).join(affected_series.lazy(), on=series_keys, how="semi")
+            )
+        else:
+            df = df.clear()
+    else:
+        logger.info("Full rebuild from the whole day fact history")
 
-    # Reapply antitrust masking after aggregation with appropriate window
-    if mask_selection:
-        df = _apply_antitrust_masking(
-            df=df,
-            mask_selection=mask_selection,
-            granularity=granularity,
+    # fingerprints identify bronze rows, they are not carried into aggregates
+    df = df.drop(ROW_FINGERPRINT_COL, strict=False)
+
+    # group_by_dynamic requires sorted input on the index column, sorted once for all outputs
+    day_rows = df.sort([*series_keys, "time_period_end_date"]).collect()
+
+    for output_name, sampling_period in sampling_periods.items():
+        asset_key = context.asset_key_for_output(output_name)
+        _record_load(
+            context=context,
+            is_incremental=changed_rows is not None,
+            upstream_key=day_fact_key,
+            version=version,
+            output_name=output_name,
         )
+        df = day_rows.lazy()
+        if output_name in affected_buckets:
+            df = (
+                df.with_columns(
+                    _bucket_start=pl.col("time_period_end_date").dt.truncate(
+                        sampling_period
+                    )
+                )
+                .join(
+                    affected_buckets[output_name].lazy(),
+                    on=[*series_keys, "_bucket_start"],
+                    how="semi",
+                    maintain_order="left",
+                )
+                .drop("_bucket_start")
+            )
 
-    add_materialization_metadata(
-        context=context,
-        df=df,
-        count_dates_in_col="time_period_end_date",
-        count_rows=False,
-    )
-    return df
+        df = df.group_by_dynamic(
+            index_column="time_period_end_date",
+            group_by=series_keys,
+            every=sampling_period,
+            label="right",
+        ).agg(
+            pl.col(carried_cols).first(),
+            cs.numeric().sum(),
+        )
+        df = add_ingestion_metadata(df=df, data_source="aggregation")
+
+        # Reapply antitrust masking after aggregation with appropriate window
+        if mask_selection:
+            df = _apply_antitrust_masking(
+                df=df,
+                mask_selection=mask_selection,
+                granularity=granularity_map[sampling_period],
+                history=None
+                if changed_rows is None
+                else _load_silver_table(context, asset_key),
+            )
+
+        df = add_time_period_end_month(df)
+        df = add_materialization_metadata(
+            context=context,
+            df=df,
+            count_dates_in_col="time_period_end_date",
+            count_rows=False,
+            asset_key=asset_key,
+        )
+        narrow_merge_predicate(context=context, df=df, asset_key=asset_key)
+        yield dg.Output(df, output_name=output_name)
@@ -0,0 +1,151 @@
+import os
+import datetime as dt
+import polars as pl
+from dagster_demo.components.constants import LANDING_ZONE, STAGING_ZONE
+from dagster_demo.components.logger import logger
+from dagster_demo.components.state_files import read_state_file, write_state_file
+
+# rows per parquet row group in staged files; small enough for min/max statistics to prune on dates
+STAGING_ROW_GROUP_SIZE = 128 * 1024
+
+staging_map_pl_schema: dict[str, pl.DataType] = {
+    "landing_file_path": pl.String(),
+    "landing_file_size_bytes": pl.Int64(),
+    "landing_file_modified_ns": pl.Int64(),
+    "staged_file_path": pl.String(),
+    "staged_rows": pl.Int64(),
+    "staged_at_utc_datetime": pl.Datetime(time_unit="us", time_zone="UTC"),
+}
+
+
+def _staging_map_path(directory: str) -> str:
+    map_name = os.path.normpath(directory).strip(os.sep).replace(os.sep, "_")
+    return f"{STAGING_ZONE}/_map/{map_name}.parquet"
+
+
+def _staged_file_path(landing_file_path: str) -> str:
+    """Mirror the landing layout under the staging zone, keeping the original extension
+    in the name so `x.csv` and `x.txt` never stage to the same file."""
+    relative_path = os.path.relpath(landing_file_path, LANDING_ZONE)
+    return os.path.normpath(f"{STAGING_ZONE}/{relative_path}.parquet")
+
+
+# landing file extensions staged to parquet, parquet files are read as they land
+STAGED_EXTENSIONS = (".csv", ".txt", ".json", ".ndjson", ".jsonl")
+
+
+def is_supported_landing_file(file_path: str) -> bool:
+    """Whether a landing file can be read, unsupported files are logged to be skipped."""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".parquet" or extension in STAGED_EXTENSIONS:
+        return True
+    logger.warning(f"Skipping landing file of unsupported format: {file_path}")
+    return False
+
+
+def _scan_landing_file(file_path: str, read_options: dict) -> pl.LazyFrame:
+    match os.path.splitext(file_path)[1].lower():
+        case ".csv" | ".txt":
+            # keep raw text values, types are enforced in silver (or by the bronze schema hints)
+            return pl.scan_csv(file_path, infer_schema=False, **read_options)
+        case ".json":
+            return pl.read_json(file_path, **read_options).lazy()
+        case ".ndjson" | ".jsonl":
+            return pl.scan_ndjson(file_path, **read_options)
+        case _:
+            # callers skip the files is_supported_landing_file rejects
+            raise NotImplementedError(f"Unsupported landing file format: {file_path}")
+
+
+def load_staging_map(directory: str) -> pl.DataFrame:
+    """Load the landing file -> staged parquet file mapping of a landing directory."""
+    return read_state_file(_staging_map_path(directory), staging_map_pl_schema)
+
+
+def stage_landing_files(
+    directory: str,
+    file_paths: list[str],
+    read_options: dict | None = None,
+    sort_by: list[str] | None = None,
+) -> list[str]:
+    """Convert text (CSV/TXT/JSON) landing files to parquet once, by the first run reading them.
+
+    Files are sorted by `sort_by` (typically the date column) and written in
+    `STAGING_ROW_GROUP_SIZE` row groups with statistics, so later reads by bronze assets,
+    sensors and backfills are columnar and pruned instead of full text parses.
+    Parquet landing files are already columnar and are returned unchanged, files of
+    unsupported formats are logged and skipped.
+    Files already staged with the same size and mtime are not converted again.
+
+    Returns the staged file paths, in the order of `file_paths`.
+    """
+    read_options = read_options or {}
+    staging_map = load_staging_map(directory)
+    already_staged = {
+        (row["landing_file_path"], row["landing_file_size_bytes"]): row
+        for row in staging_map.iter_rows(named=True)
+    }
+
+    staged_file_paths = []
+    new_entries = []
+    for file_path in file_paths:
+        file_path = os.path.normpath(file_path)
+        if not is_supported_landing_file(file_path):
+            continue
+        if file_path.endswith(".parquet"):
+            staged_file_paths.append(file_path)
+            continue
+
+        stat = os.stat(file_path)
+        previous = already_staged.get((file_path, stat.st_size))
+        if (
+            previous is not None
+            and previous["landing_file_modified_ns"] == stat.st_mtime_ns
+            and os.path.exists(previous["staged_file_path"])
+        ):
+            staged_file_paths.append(previous["staged_file_path"])
+            continue
+
+        staged_file_path = _staged_file_path(file_path)
+        os.makedirs(os.path.dirname(staged_file_path), exist_ok=True)
+        df = _scan_landing_file(file_path, read_options)
+        if sort_by:
+            df = df.sort(sort_by)
+        df = df.collect()
+        # written then renamed, concurrent runs staging the same file never read a partial one
+        df.write_parquet(
+            f"{staged_file_path}.{os.getpid()}.tmp",
+            statistics=True,
+            row_group_size=STAGING_ROW_GROUP_SIZE,
+        )
+        os.replace(f"{staged_file_path}.{os.getpid()}.tmp", staged_file_path)
+        staged_file_paths.append(staged_file_path)
+        new_entries.append(
+            {
+                "landing_file_path": file_path,
+                "landing_file_size_bytes": stat.st_size,
+                "landing_file_modified_ns": stat.st_mtime_ns,
+                "staged_file_path": staged_file_path,
+                "staged_rows": df.height,
+                "staged_at_utc_datetime": dt.datetime.now(tz=dt.timezone.utc),
+            }
+        )
+
+    if new_entries:
+        new_entries_df = pl.DataFrame(new_entries, schema=staging_map_pl_schema)
+        staging_map = pl.concat(
+            [
+                staging_map.filter(
+                    ~pl.col("landing_file_path").is_in(
+                        new_entries_df["landing_file_path"].implode()
+                    )
+                ),
+                new_entries_df,
+            ]
+        )
+        write_state_file(staging_map, _staging_map_path(directory))
+        logger.info(
+            f"Staged {len(new_entries)} landing files from {directory} as parquet"
+        )
+
+    return staged_file_paths
@@ -0,0 +1,18 @@
+import os
+import polars as pl
+
+
+def read_state_file(path: str, schema: dict[str, pl.DataType]) -> pl.DataFrame:
+    """Read a parquet state file (landing index, partition index, staging map).
+    Returns an empty frame with `schema` before the file is first written."""
+    if not os.path.exists(path):
+        return pl.DataFrame(schema=schema)
+    return pl.read_parquet(path)
+
+
+def write_state_file(df: pl.DataFrame, path: str):
+    """Overwrite a parquet state file.
+    Written then renamed, so a crashed sensor tick never leaves a truncated file behind."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.write_parquet(f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
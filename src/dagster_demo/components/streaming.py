@@ -0,0 +1,65 @@
+import atexit
+import shutil
+import tempfile
+import dagster as dg
+import polars as pl
+from collections.abc import Iterator
+from arro3.core import RecordBatchReader, Table
+
+# asset metadata keys selecting how an asset's plan is executed and written
+EXECUTION_MODE_METADATA_KEY = "execution_mode"
+# memory the write batches of an asset may use. It only sizes the batches, it is not a
+# bound on the step's memory: the plan's memory-intensive nodes (joins, sorts, group-bys)
+# buffer their state on the streaming engine, and polars exposes no API to report nodes
+# falling back to in-memory execution
+WRITE_BATCH_BUDGET_METADATA_KEY = "write_batch_budget_mb"
+
+# share of the write batch budget a single batch may use: polars keeps several morsels
+# in flight and the delta writer buffers a row group per open partition
+_BATCH_SHARE_OF_BUDGET = 8
+# assumed average width of variable size values (strings, lists) when sizing batches
+_VARIABLE_WIDTH_BYTES = 32
+
+
+def get_execution_mode(
+    context: dg.AssetExecutionContext, asset_key: dg.AssetKey | None = None
+) -> str:
+    """Return the execution mode declared in the asset metadata, "in-memory" by default.
+    Multi-assets pass the `asset_key` of the output."""
+    metadata = context.assets_def.metadata_by_key[asset_key or context.asset_key]
+    return metadata.get(EXECUTION_MODE_METADATA_KEY, "in-memory")
+
+
+def spill_to_parquet(df: pl.LazyFrame) -> pl.LazyFrame:
+    """Execute `df` once on the streaming engine into a temporary parquet file and scan it.
+
+    The streaming counterpart of `collect()`: later reads (metrics, integrity checks,
+    merge predicate bounds, the batched write) scan the spilled result instead of
+    executing the upstream plan again. The file is removed when the process exits.
+    """
+    spill_dir = tempfile.mkdtemp(prefix="dagster_demo_spill_")
+    atexit.register(shutil.rmtree, spill_dir, ignore_errors=True)
+    path = f"{spill_dir}/result.parquet"
+    df.sink_parquet(path, engine="streaming")
+    return pl.scan_parquet(path)
+
+
+def batch_rows_for_budget(schema: pl.Schema, write_batch_budget_mb: int) -> int:
+    """Number of rows per write batch that keeps a batch within its share of the budget."""
+    row_bytes = sum(
+        8 if dtype.is_numeric() or dtype.is_temporal() else _VARIABLE_WIDTH_BYTES
+        for dtype in schema.dtypes()
+    )
+    batch_bytes = write_batch_budget_mb * 1024 * 1024 // _BATCH_SHARE_OF_BUDGET
+    return max(batch_bytes // max(row_bytes, 1), 1024)
+
+
+def stream_batches(df: pl.LazyFrame, batch_rows: int) -> RecordBatchReader:
+    """Read `df` as a record batch reader of `batch_rows` rows, on the streaming engine."""
+    schema = Table.from_arrow(df.clear().collect()).schema
+
+    def batches() -> Iterator:
+        for batch in df.collect_batches(chunk_size=batch_rows, engine="streaming"):
+            yield from Table.from_arrow(batch).to_batches()
+
+    return RecordBatchReader.from_batches(schema, batches())
@@ -13,8 +13,6 @@ from dagster_demo.defs.assets.carretwo_fr.silver import (
     carretwo_fr_silver_prod_dim,
     carretwo_fr_silver_site_dim,
     carretwo_fr_silver_day_fact,
-    carretwo_fr_silver_week_fact,
-    carretwo_fr_silver_month_fact,
 )
 
 
@@ -69,7 +67,7 @@ def silver_day_fact_schema_check(
     return dg.AssetCheckResult(passed=check_results["passed"], metadata=check_results)
 
 
-@dg.asset_check(asset=carretwo_fr_silver_week_fact, blocking=True)
+@dg.asset_check(asset="carretwo_fr_silver_week_fact", blocking=True)
 def silver_week_fact_schema_check(
     context: dg.AssetCheckExecutionContext, carretwo_fr_silver_week_fact: pl.LazyFrame
 ):
@@ -86,7 +84,7 @@ def silver_week_fact_schema_check(
     return dg.AssetCheckResult(passed=check_results["passed"], metadata=check_results)
 
 
-@dg.asset_check(asset=carretwo_fr_silver_month_fact, blocking=True)
+@dg.asset_check(asset="carretwo_fr_silver_month_fact", blocking=True)
 def silver_month_fact_schema_check(
     context: dg.AssetCheckExecutionContext, carretwo_fr_silver_month_fact: pl.LazyFrame
 ):
@@ -1,6 +1,10 @@
 # EXAMPLE DATA: faker/data/daily_files
 
-from dagster_demo.components.config_utils import build_retailer_config
+import polars as pl
+from dagster_demo.components.config_utils import (
+    build_data_provider_code,
+    build_retailer_config,
+)
 
 RETAILER_ID = 1001
 DATA_SOURCE_NAME = "uploader"
@@ -9,6 +13,20 @@ DATE_COLUMN = "date"
 DIRECTORY, SECURE_GROUP_KEY, RETAILER_NAME, REGION, COUNTRY = build_retailer_config(
     RETAILER_ID
 )
+DATA_PROVIDER_CODE = build_data_provider_code(RETAILER_ID)
+
+# Bronze storage: "string" casts every column to string, "typed" stores the columns of
+# BRONZE_SCHEMA_HINT with their declared dtype (and the remaining columns as strings).
+# Switching an existing bronze table between modes requires rebuilding it,
+# since delta schema merge does not change the type of existing columns.
+# The hint below is the typed layout for this retailer, used only once the table is rebuilt.
+BRONZE_STORAGE_MODE = "string"
+BRONZE_SCHEMA_HINT = {
+    "date": pl.Date(),
+    "sales_qty": pl.Int64(),
+    "sales_value_usd": pl.Float64(),
+    "store_id": pl.Int64(),
+}
 
 # SCD Type 2 tracked columns - columns that trigger dimension versioning when changed
 PROD_DIM_SCD_COLS = [
@@ -1,11 +1,18 @@
 import dagster as dg
 import polars as pl
+from dagster_demo.components.polars_schemas import (
+    prod_dim_key_map_cols,
+    site_dim_key_map_cols,
+)
+from dagster_demo.components.constants import DATA_PROVIDER_CODE_TAG
 from dagster_demo.defs.assets.carretwo_fr import config as cfg
 from dagster_demo.components.silver import (
+    SilverFactConfig,
+    select_new_bronze_rows,
     silver_fact_processing,
     silver_prod_dim_processing,
     silver_site_dim_processing,
-    silver_fact_downsample,
+    silver_fact_rollup,
 )
 
 
@@ -19,17 +26,37 @@ from dagster_demo.components.silver import (
         "region": cfg.REGION,
         "country": cfg.COUNTRY,
         "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
+        "partition_by": ["time_period_end_month"],
+    },
+    ins={
+        "carretwo_fr_silver_prod_dim": dg.AssetIn(
+            metadata={"columns": prod_dim_key_map_cols}
+        ),
+        "carretwo_fr_silver_site_dim": dg.AssetIn(
+            metadata={"columns": site_dim_key_map_cols}
+        ),
     },
     kinds={"polars", "deltalake", "silver"},
+    tags={DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE},
 )
 def carretwo_fr_silver_day_fact(
     context: dg.AssetExecutionContext,
+    config: SilverFactConfig,
     carretwo_fr_bronze_day_fact: pl.LazyFrame,
     carretwo_fr_silver_prod_dim: pl.LazyFrame,
     carretwo_fr_silver_site_dim: pl.LazyFrame,
 ) -> pl.LazyFrame:
-    df = carretwo_fr_bronze_day_fact.select(
-        pl.col("date").str.to_date("%Y-%m-%d").alias("time_period_end_date"),
+    df = select_new_bronze_rows(
+        context=context,
+        df=carretwo_fr_bronze_day_fact,
+        input_name="carretwo_fr_bronze_day_fact",
+        full_rebuild=config.full_rebuild,
+    ).select(
+        (
+            pl.col("date").str.to_date("%Y-%m-%d")
+            if cfg.BRONZE_STORAGE_MODE == "string"
+            else pl.col("date")
+        ).alias("time_period_end_date"),
         pl.col("product_id").alias("prod_id"),
         pl.col("store_id").alias("site_id"),
         pl.col("sales_qty").cast(pl.Int64).alias("pos_sales_units"),
@@ -39,6 +66,7 @@ def carretwo_fr_silver_day_fact(
         pl.col("created_at_date"),
         pl.col("data_source"),
         pl.col("data_provider_code"),
+        pl.col("row_fingerprint"),
     )
     df = silver_fact_processing(
         context=context,
@@ -47,6 +75,7 @@ def carretwo_fr_silver_day_fact(
         site_dim=carretwo_fr_silver_site_dim,
         antitrust_masking_selection="value",
         granularity="daily",
+        full_rebuild=config.full_rebuild,
     )
     return df
 
@@ -61,8 +90,10 @@ def carretwo_fr_silver_day_fact(
         "region": cfg.REGION,
         "country": cfg.COUNTRY,
         "merge_predicate": "s.prod_key = t.prod_key",
+        "dimension_cache": True,
     },
     kinds={"polars", "deltalake", "silver"},
+    tags={DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE},
 )
 def carretwo_fr_silver_prod_dim(
     context: dg.AssetExecutionContext, carretwo_fr_bronze_day_fact: pl.LazyFrame
@@ -94,8 +125,10 @@ def carretwo_fr_silver_prod_dim(
         "region": cfg.REGION,
         "country": cfg.COUNTRY,
         "merge_predicate": "s.site_key = t.site_key",
+        "dimension_cache": True,
     },
     kinds={"polars", "deltalake", "silver"},
+    tags={DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE},
 )
 def carretwo_fr_silver_site_dim(
     context: dg.AssetExecutionContext, carretwo_fr_bronze_day_fact: pl.LazyFrame
@@ -117,59 +150,71 @@ def carretwo_fr_silver_site_dim(
     return df
 
 
-@dg.asset(
-    io_manager_key="silver_polars_delta_merge_io_manager",
-    automation_condition=dg.AutomationCondition.eager(),
-    group_name=cfg.RETAILER_NAME,
-    metadata={
-        "ssid": cfg.RETAILER_ID,
-        "name": cfg.RETAILER_NAME,
-        "region": cfg.REGION,
-        "country": cfg.COUNTRY,
-        "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
-    },
-    kinds={"polars", "deltalake", "silver"},
-    tags={"aggregation": "day_to_week"},
-)
-def carretwo_fr_silver_week_fact(
-    context: dg.AssetExecutionContext, carretwo_fr_silver_day_fact: pl.LazyFrame
-) -> pl.LazyFrame:
-    df = silver_fact_downsample(
-        context=context, df=carretwo_fr_silver_day_fact, sampling_period="1w"
-    )
-    return df
-
-
-@dg.asset(
-    io_manager_key="silver_polars_delta_merge_io_manager",
-    automation_condition=dg.AutomationCondition.eager(),
-    group_name=cfg.RETAILER_NAME,
-    metadata={
-        "ssid": cfg.RETAILER_ID,
-        "name": cfg.RETAILER_NAME,
-        "region": cfg.REGION,
-        "country": cfg.COUNTRY,
-        "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
+@dg.multi_asset(
+    outs={
+        "carretwo_fr_silver_week_fact": dg.AssetOut(
+            # only unselected outputs are skipped
+            is_required=False,
+            io_manager_key="silver_polars_delta_merge_io_manager",
+            automation_condition=dg.AutomationCondition.eager(),
+            group_name=cfg.RETAILER_NAME,
+            metadata={
+                "ssid": cfg.RETAILER_ID,
+                "name": cfg.RETAILER_NAME,
+                "region": cfg.REGION,
+                "country": cfg.COUNTRY,
+                "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
+                "partition_by": ["time_period_end_month"],
+            },
+            kinds={"polars", "deltalake", "silver"},
+            tags={
+                "aggregation": "day_to_week",
+                DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE,
+            },
+        ),
+        "carretwo_fr_silver_month_fact": dg.AssetOut(
+            # only unselected outputs are skipped
+            is_required=False,
+            io_manager_key="silver_polars_delta_merge_io_manager",
+            automation_condition=dg.AutomationCondition.eager(),
+            group_name=cfg.RETAILER_NAME,
+            metadata={
+                "ssid": cfg.RETAILER_ID,
+                "name": cfg.RETAILER_NAME,
+                "region": cfg.REGION,
+                "country": cfg.COUNTRY,
+                "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
+                "partition_by": ["time_period_end_month"],
+            },
+            kinds={"polars", "deltalake", "silver"},
+            tags={
+                "aggregation": "day_to_month",
+                DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE,
+            },
+        ),
     },
-    kinds={"polars", "deltalake", "silver"},
-    tags={"aggregation": "day_to_month"},
+    can_subset=True,
 )
-def carretwo_fr_silver_month_fact(
-    context: dg.AssetExecutionContext, carretwo_fr_silver_day_fact: pl.LazyFrame
-) -> pl.LazyFrame:
-    df = silver_fact_downsample(
+def carretwo_fr_silver_fact_rollup(
+    context: dg.AssetExecutionContext,
+    config: SilverFactConfig,
+    carretwo_fr_silver_day_fact: pl.LazyFrame,
+):
+    yield from silver_fact_rollup(
         context=context,
         df=carretwo_fr_silver_day_fact,
-        sampling_period="1mo",
+        sampling_periods={
+            "carretwo_fr_silver_week_fact": "1w",
+            "carretwo_fr_silver_month_fact": "1mo",
+        },
+        full_rebuild=config.full_rebuild,
     )
-    return df
 
 
 defs = dg.Definitions(
     assets=[
         carretwo_fr_silver_day_fact,
-        carretwo_fr_silver_week_fact,
-        carretwo_fr_silver_month_fact,
+        carretwo_fr_silver_fact_rollup,
         carretwo_fr_silver_prod_dim,
         carretwo_fr_silver_site_dim,
     ],
@@ -0,0 +1,101 @@
+import os
+import dagster as dg
+import polars as pl
+from dagster_demo.components.constants import (
+    CORPORATE_PRODUCT_MASTER_DATA_PATH,
+    CORPORATE_SITE_MASTER_DATA_PATH,
+)
+from dagster_demo.components.silver import corporate_master_data_processing
+
+
+def _extract_data_version(path: str) -> dg.DataVersion:
+    # an extract is identified by its size and modification time, like landing files
+    stat = os.stat(path)
+    return dg.DataVersion(f"{stat.st_size}-{stat.st_mtime_ns}")
+
+
+@dg.observable_source_asset(group_name="corporate")
+def corporate_product_master_extract() -> dg.DataVersion:
+    """Corporate product master extract delivered by the MDM system."""
+    return _extract_data_version(CORPORATE_PRODUCT_MASTER_DATA_PATH)
+
+
+@dg.observable_source_asset(group_name="corporate")
+def corporate_site_master_extract() -> dg.DataVersion:
+    """Corporate site master extract delivered by the MDM system."""
+    return _extract_data_version(CORPORATE_SITE_MASTER_DATA_PATH)
+
+
+@dg.asset(
+    io_manager_key="silver_polars_delta_merge_io_manager",
+    # runs when an observation reports a new extract version
+    automation_condition=dg.AutomationCondition.eager(),
+    group_name="corporate",
+    deps=[corporate_product_master_extract],
+    metadata={
+        "mode": "overwrite",  # published as a whole, sorted by the join key
+        "schema_mode": "overwrite",
+        "dimension_cache": True,
+    },
+    kinds={"polars", "deltalake", "silver"},
+)
+def corporate_product_master_data(
+    context: dg.AssetExecutionContext,
+) -> dg.Output[pl.LazyFrame]:
+    """Corporate product master, joined to retailer product dims on GTIN."""
+    return corporate_master_data_processing(
+        context=context,
+        df=pl.scan_parquet(CORPORATE_PRODUCT_MASTER_DATA_PATH),
+        join_key="corp_item_gtin",
+    )
+
+
+@dg.asset(
+    io_manager_key="silver_polars_delta_merge_io_manager",
+    # runs when an observation reports a new extract version
+    automation_condition=dg.AutomationCondition.eager(),
+    group_name="corporate",
+    deps=[corporate_site_master_extract],
+    metadata={
+        "mode": "overwrite",  # published as a whole, sorted by the join key
+        "schema_mode": "overwrite",
+        "dimension_cache": True,
+    },
+    kinds={"polars", "deltalake", "silver"},
+)
+def corporate_site_master_data(
+    context: dg.AssetExecutionContext,
+) -> dg.Output[pl.LazyFrame]:
+    """Corporate site master, joined to retailer site dims on global location number."""
+    return corporate_master_data_processing(
+        context=context,
+        df=pl.scan_parquet(CORPORATE_SITE_MASTER_DATA_PATH),
+        join_key="corp_global_location_number",
+    )
+
+
+observation_job = dg.define_asset_job(
+    name="corporate_master_extract_observation_job",
+    selection=dg.AssetSelection.assets(
+        corporate_product_master_extract.key, corporate_site_master_extract.key
+    ),
+)
+
+# observing is a stat call, the master data and its dims only run when an extract changed
+corporate_master_extract_observation_schedule = dg.ScheduleDefinition(
+    job=observation_job,
+    cron_schedule="*/15 * * * *",
+    default_status=dg.DefaultScheduleStatus.RUNNING,
+)
+
+
+defs = dg.Definitions(
+    assets=[
+        corporate_product_master_extract,
+        corporate_site_master_extract,
+        corporate_product_master_data,
+        corporate_site_master_data,
+    ],
+    jobs=[observation_job],
+    schedules=[corporate_master_extract_observation_schedule],
+)
@@ -0,0 +1,61 @@
+import dagster as dg
+import polars as pl
+from dagster_demo.components.gold import gold_prod_attributes_processing
+from dagster_demo.components.polars_schemas import (
+    gold_prod_attributes_pl_schema,
+    gold_attributes_required_cols,
+    check_polars_schema,
+)
+from dagster_demo.defs.partitions import data_provider_partitions
+
+
+@dg.asset(
+    io_manager_key="gold_polars_delta_merge_io_manager",
+    partitions_def=data_provider_partitions,
+    metadata={
+        "partition_expr": "data_provider_code",
+        # full snapshot of the retailer's attributes, see gold_prod_dim
+        "mode": "overwrite",
+    },
+    automation_condition=dg.AutomationCondition.eager(),
+    group_name="refined",
+    kinds={"polars", "deltalake", "gold"},
+)
+def gold_prod_attributes(
+    context: dg.AssetExecutionContext,
+    lidlo_de_silver_prod_dim: pl.LazyFrame,
+    carretwo_fr_silver_prod_dim: pl.LazyFrame,
+    targetto_us_silver_prod_dim: pl.LazyFrame,
+) -> pl.LazyFrame:
+    """Typed retailer specific prod attributes, one row per prod_key and attribute."""
+    df = gold_prod_attributes_processing(
+        context,
+        [
+            lidlo_de_silver_prod_dim,
+            carretwo_fr_silver_prod_dim,
+            targetto_us_silver_prod_dim,
+        ],
+    )
+    return df
+
+
+@dg.asset_check(asset=gold_prod_attributes, blocking=True)
+def gold_prod_attributes_schema_check(
+    context: dg.AssetCheckExecutionContext, gold_prod_attributes: pl.LazyFrame
+):
+    """Validate table schema:
+    - Error if any expected columns are missing.
+    - Error on wrong types.
+    """
+    check_results = check_polars_schema(
+        df_schema=gold_prod_attributes.collect_schema(),
+        expected_schema=gold_prod_attributes_pl_schema,
+        required_cols_list=["prod_key", *gold_attributes_required_cols],
+    )
+    return dg.AssetCheckResult(passed=check_results["passed"], metadata=check_results)
+
+
+defs = dg.Definitions(
+    assets=[gold_prod_attributes],
+    asset_checks=[gold_prod_attributes_schema_check],
+)
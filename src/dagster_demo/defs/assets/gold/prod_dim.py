@@ -14,7 +14,9 @@ from dagster_demo.defs.partitions import data_provider_partitions
     partitions_def=data_provider_partitions,
     metadata={
         "partition_expr": "data_provider_code",
-        "merge_predicate": "s.prod_id = t.prod_id",
+        # the output is the partition's full snapshot: its files are replaced in a single
+        # commit (overwrite with a data_provider_code predicate) instead of merged row by row
+        "mode": "overwrite",
     },
     automation_condition=dg.AutomationCondition.eager(),
     group_name="refined",
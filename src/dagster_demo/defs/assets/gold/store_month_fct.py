@@ -1,10 +1,12 @@
 import dagster as dg
 import polars as pl
+from dagster_demo.components.change_data_feed import CHANGE_DATA_FEED_METADATA_KEY
 from dagster_demo.components.gold import gold_store_fact_processing
 from dagster_demo.defs.partitions import data_provider_partitions
 
 from dagster_demo.components.polars_schemas import (
     gold_store_fact_pl_schema,
+    store_fact_key_cols,
     store_fact_required_cols,
     check_polars_schema,
 )
@@ -13,6 +15,18 @@ from dagster_demo.components.polars_schemas import (
 @dg.asset(
     io_manager_key="gold_polars_delta_merge_io_manager",
     partitions_def=data_provider_partitions,
+    # only the silver rows changed since the partition's last materialization are read
+    ins={
+        "lidlo_de_silver_month_fact": dg.AssetIn(
+            metadata={CHANGE_DATA_FEED_METADATA_KEY: store_fact_key_cols}
+        ),
+        "carretwo_fr_silver_month_fact": dg.AssetIn(
+            metadata={CHANGE_DATA_FEED_METADATA_KEY: store_fact_key_cols}
+        ),
+        "targetto_us_silver_month_fact": dg.AssetIn(
+            metadata={CHANGE_DATA_FEED_METADATA_KEY: store_fact_key_cols}
+        ),
+    },
     metadata={
         "partition_expr": "data_provider_code",
         "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
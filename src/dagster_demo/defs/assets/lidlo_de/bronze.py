@@ -1,8 +1,19 @@
 import dagster as dg
 import polars as pl
+from typing import Iterator
 from dagster_demo.defs.assets.lidlo_de import config as cfg
 from dagster_demo.components.bronze import bronze_processing
-from dagster_demo.components.sensors import detect_new_files_in_dir
+from dagster_demo.components.sensors import (
+    scan_landing_directory,
+    request_run_for_files,
+)
+from dagster_demo.components.manifest import (
+    LandingFilesConfig,
+    add_ingested_files_metadata,
+    filter_ingested_files,
+    record_ingestion_manifest,
+    resolve_files_to_ingest,
+)
 from dagster_demo.defs.resources.freshness_policy import daily_policy
 
 
@@ -17,16 +28,27 @@ from dagster_demo.defs.resources.freshness_policy import daily_policy
     },
     kinds={"polars", "deltalake", "bronze"},
     freshness_policy=daily_policy,
+    hooks={record_ingestion_manifest},
+    output_required=False,  # nothing is materialized when every file was already ingested
 )
-def lidlo_de_bronze_day_fact(context: dg.AssetExecutionContext) -> pl.LazyFrame:
+def lidlo_de_bronze_day_fact(
+    context: dg.AssetExecutionContext, config: LandingFilesConfig
+) -> Iterator[dg.Output[pl.LazyFrame]]:
     """Lidlo Germany shares a new file with many dates in one file."""
-    df = pl.scan_parquet(cfg.DIRECTORY)
+    file_paths = resolve_files_to_ingest(
+        context=context, directory=cfg.DIRECTORY, config=config
+    )
+    if not file_paths:
+        context.log.info("No new files to ingest. Skipping materialization.")
+        return
+    df = pl.scan_parquet(file_paths)
     df = bronze_processing(
         context=context,
         df=df,
         config=cfg,
     )
-    return df
+    add_ingested_files_metadata(context=context, file_paths=file_paths)
+    yield dg.Output(df)
 
 
 job = dg.define_asset_job(
@@ -41,10 +63,12 @@ job = dg.define_asset_job(
     job=job,
 )
 def sensor_lidlo_de_bronze_day_fact(context: dg.SensorEvaluationContext):
-    new_files = detect_new_files_in_dir(directory=cfg.DIRECTORY, context=context)
+    new_files = scan_landing_directory(directory=cfg.DIRECTORY, context=context)
+    asset_name = lidlo_de_bronze_day_fact.key.path[-1]
+    new_files = filter_ingested_files(asset_name=asset_name, file_paths=new_files)
     if new_files:
         context.log.info(f"Found new files: {new_files}. Triggering run...")
-        yield dg.RunRequest()
+        yield request_run_for_files(asset_name=asset_name, file_paths=new_files)
     else:
         yield dg.SkipReason("No new files found")
 
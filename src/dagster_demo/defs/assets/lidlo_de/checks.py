@@ -13,8 +13,6 @@ from dagster_demo.defs.assets.lidlo_de.silver import (
     lidlo_de_silver_prod_dim,
     lidlo_de_silver_site_dim,
     lidlo_de_silver_day_fact,
-    lidlo_de_silver_week_fact,
-    lidlo_de_silver_month_fact,
 )
 
 
@@ -69,7 +67,7 @@ def silver_day_fact_schema_check(
     return dg.AssetCheckResult(passed=check_results["passed"], metadata=check_results)
 
 
-@dg.asset_check(asset=lidlo_de_silver_week_fact, blocking=True)
+@dg.asset_check(asset="lidlo_de_silver_week_fact", blocking=True)
 def silver_week_fact_schema_check(
     context: dg.AssetCheckExecutionContext, lidlo_de_silver_week_fact: pl.LazyFrame
 ):
@@ -86,7 +84,7 @@ def silver_week_fact_schema_check(
     return dg.AssetCheckResult(passed=check_results["passed"], metadata=check_results)
 
 
-@dg.asset_check(asset=lidlo_de_silver_month_fact, blocking=True)
+@dg.asset_check(asset="lidlo_de_silver_month_fact", blocking=True)
 def silver_month_fact_schema_check(
     context: dg.AssetCheckExecutionContext, lidlo_de_silver_month_fact: pl.LazyFrame
 ):
@@ -1,6 +1,9 @@
 # EXAMPLE DATA: faker/data/single_file_many_dates
 
-from dagster_demo.components.config_utils import build_retailer_config
+from dagster_demo.components.config_utils import (
+    build_data_provider_code,
+    build_retailer_config,
+)
 
 RETAILER_ID = 1002
 DATA_SOURCE_NAME = "uploader"
@@ -9,6 +12,12 @@ DATE_COLUMN = "date"
 DIRECTORY, SECURE_GROUP_KEY, RETAILER_NAME, REGION, COUNTRY = build_retailer_config(
     RETAILER_ID
 )
+DATA_PROVIDER_CODE = build_data_provider_code(RETAILER_ID)
+
+# Bronze storage: "string" casts every column to string, "typed" stores the columns of
+# BRONZE_SCHEMA_HINT with their declared dtype (see carretwo_fr)
+BRONZE_STORAGE_MODE = "string"
+BRONZE_SCHEMA_HINT = {}
 
 # SCD Type 2 tracked columns - columns that trigger dimension versioning when changed
 PROD_DIM_SCD_COLS = [
@@ -1,11 +1,18 @@
 import dagster as dg
 import polars as pl
+from dagster_demo.components.polars_schemas import (
+    prod_dim_key_map_cols,
+    site_dim_key_map_cols,
+)
+from dagster_demo.components.constants import DATA_PROVIDER_CODE_TAG
 from dagster_demo.defs.assets.lidlo_de import config as cfg
 from dagster_demo.components.silver import (
+    SilverFactConfig,
+    select_new_bronze_rows,
     silver_fact_processing,
     silver_prod_dim_processing,
     silver_site_dim_processing,
-    silver_fact_downsample,
+    silver_fact_rollup,
 )
 
 
@@ -19,16 +26,32 @@ from dagster_demo.components.silver import (
         "region": cfg.REGION,
         "country": cfg.COUNTRY,
         "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
+        "partition_by": ["time_period_end_month"],
+    },
+    ins={
+        "lidlo_de_silver_prod_dim": dg.AssetIn(
+            metadata={"columns": prod_dim_key_map_cols}
+        ),
+        "lidlo_de_silver_site_dim": dg.AssetIn(
+            metadata={"columns": site_dim_key_map_cols}
+        ),
     },
     kinds={"polars", "deltalake", "silver"},
+    tags={DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE},
 )
 def lidlo_de_silver_day_fact(
     context: dg.AssetExecutionContext,
+    config: SilverFactConfig,
     lidlo_de_bronze_day_fact: pl.LazyFrame,
     lidlo_de_silver_prod_dim: pl.LazyFrame,
     lidlo_de_silver_site_dim: pl.LazyFrame,
 ) -> pl.LazyFrame:
-    df = lidlo_de_bronze_day_fact.select(
+    df = select_new_bronze_rows(
+        context=context,
+        df=lidlo_de_bronze_day_fact,
+        input_name="lidlo_de_bronze_day_fact",
+        full_rebuild=config.full_rebuild,
+    ).select(
         pl.col("date").str.to_date("%Y-%m-%d").alias("time_period_end_date"),
         pl.col("product_id").alias("prod_id"),
         pl.col("store_id").alias("site_id"),
@@ -46,6 +69,7 @@ def lidlo_de_silver_day_fact(
         pl.col("created_at_date"),
         pl.col("data_source"),
         pl.col("data_provider_code"),
+        pl.col("row_fingerprint"),
     )
     df = silver_fact_processing(
         context=context,
@@ -54,6 +78,7 @@ def lidlo_de_silver_day_fact(
         site_dim=lidlo_de_silver_site_dim,
         antitrust_masking_selection="volume",
         granularity="daily",
+        full_rebuild=config.full_rebuild,
     )
     return df
 
@@ -68,11 +93,15 @@ def lidlo_de_silver_day_fact(
         "region": cfg.REGION,
         "country": cfg.COUNTRY,
         "merge_predicate": "s.prod_key = t.prod_key",
+        "dimension_cache": True,
     },
     kinds={"polars", "deltalake", "silver"},
+    tags={DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE},
 )
 def lidlo_de_silver_prod_dim(
-    context: dg.AssetExecutionContext, lidlo_de_bronze_day_fact: pl.LazyFrame
+    context: dg.AssetExecutionContext,
+    lidlo_de_bronze_day_fact: pl.LazyFrame,
+    corporate_product_master_data: pl.LazyFrame,
 ) -> pl.LazyFrame:
     df = lidlo_de_bronze_day_fact.select(
         pl.col("product_id").alias("prod_id"),
@@ -92,6 +121,7 @@ def lidlo_de_silver_prod_dim(
         context=context,
         incoming_dim=df,
         scd_cols=cfg.PROD_DIM_SCD_COLS,
+        corporate_master_data=corporate_product_master_data,
     )
     return df
 
@@ -106,11 +136,15 @@ def lidlo_de_silver_prod_dim(
         "region": cfg.REGION,
         "country": cfg.COUNTRY,
         "merge_predicate": "s.site_key = t.site_key",
+        "dimension_cache": True,
     },
     kinds={"polars", "deltalake", "silver"},
+    tags={DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE},
 )
 def lidlo_de_silver_site_dim(
-    context: dg.AssetExecutionContext, lidlo_de_bronze_day_fact: pl.LazyFrame
+    context: dg.AssetExecutionContext,
+    lidlo_de_bronze_day_fact: pl.LazyFrame,
+    corporate_site_master_data: pl.LazyFrame,
 ) -> pl.LazyFrame:
     df = lidlo_de_bronze_day_fact.select(
         pl.col("store_id").alias("site_id"),
@@ -131,54 +165,70 @@ def lidlo_de_silver_site_dim(
         context=context,
         incoming_dim=df,
         scd_cols=cfg.SITE_DIM_SCD_COLS,
+        corporate_master_data=corporate_site_master_data,
     )
     return df
 
 
-@dg.asset(
-    io_manager_key="silver_polars_delta_merge_io_manager",
-    automation_condition=dg.AutomationCondition.eager(),
-    group_name=cfg.RETAILER_NAME,
-    metadata={
-        "ssid": cfg.RETAILER_ID,
-        "name": cfg.RETAILER_NAME,
-        "region": cfg.REGION,
-        "country": cfg.COUNTRY,
-        "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
+@dg.multi_asset(
+    outs={
+        "lidlo_de_silver_week_fact": dg.AssetOut(
+            # only unselected outputs are skipped
+            is_required=False,
+            io_manager_key="silver_polars_delta_merge_io_manager",
+            automation_condition=dg.AutomationCondition.eager(),
+            group_name=cfg.RETAILER_NAME,
+            metadata={
+                "ssid": cfg.RETAILER_ID,
+                "name": cfg.RETAILER_NAME,
+                "region": cfg.REGION,
+                "country": cfg.COUNTRY,
+                "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
+                "partition_by": ["time_period_end_month"],
+            },
+            kinds={"polars", "deltalake", "silver"},
+            tags={
+                "aggregation": "day_to_week",
+                DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE,
+            },
+        ),
+        "lidlo_de_silver_month_fact": dg.AssetOut(
+            # only unselected outputs are skipped
+            is_required=False,
+            io_manager_key="silver_polars_delta_merge_io_manager",
+            automation_condition=dg.AutomationCondition.eager(),
+            group_name=cfg.RETAILER_NAME,
+            metadata={
+                "ssid": cfg.RETAILER_ID,
+                "name": cfg.RETAILER_NAME,
+                "region": cfg.REGION,
+                "country": cfg.COUNTRY,
+                "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
+                "partition_by": ["time_period_end_month"],
+            },
+            kinds={"polars", "deltalake", "silver"},
+            tags={
+                "aggregation": "day_to_month",
+                DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE,
+            },
+        ),
     },
-    kinds={"polars", "deltalake", "silver"},
-    tags={"aggregation": "day_to_week"},
+    can_subset=True,
 )
-def lidlo_de_silver_week_fact(
-    context: dg.AssetExecutionContext, lidlo_de_silver_day_fact: pl.LazyFrame
-) -> pl.LazyFrame:
-    df = silver_fact_downsample(
-        context=context, df=lidlo_de_silver_day_fact, sampling_period="1w"
-    )
-    return df
-
-
-@dg.asset(
-    io_manager_key="silver_polars_delta_merge_io_manager",
-    automation_condition=dg.AutomationCondition.eager(),
-    group_name=cfg.RETAILER_NAME,
-    metadata={
-        "ssid": cfg.RETAILER_ID,
-        "name": cfg.RETAILER_NAME,
-        "region": cfg.REGION,
-        "country": cfg.COUNTRY,
-        "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
-    },
-    kinds={"polars", "deltalake", "silver"},
-    tags={"aggregation": "day_to_month"},
-)
-def lidlo_de_silver_month_fact(
-    context: dg.AssetExecutionContext, lidlo_de_silver_day_fact: pl.LazyFrame
-) -> pl.LazyFrame:
-    df = silver_fact_downsample(
-        context=context, df=lidlo_de_silver_day_fact, sampling_period="1mo"
+def lidlo_de_silver_fact_rollup(
+    context: dg.AssetExecutionContext,
+    config: SilverFactConfig,
+    lidlo_de_silver_day_fact: pl.LazyFrame,
+):
+    yield from silver_fact_rollup(
+        context=context,
+        df=lidlo_de_silver_day_fact,
+        sampling_periods={
+            "lidlo_de_silver_week_fact": "1w",
+            "lidlo_de_silver_month_fact": "1mo",
+        },
+        full_rebuild=config.full_rebuild,
     )
-    return df
 
 
 defs = dg.Definitions(
@@ -186,7 +236,6 @@ defs = dg.Definitions(
         lidlo_de_silver_day_fact,
         lidlo_de_silver_prod_dim,
         lidlo_de_silver_site_dim,
-        lidlo_de_silver_week_fact,
-        lidlo_de_silver_month_fact,
+        lidlo_de_silver_fact_rollup,
     ],
 )
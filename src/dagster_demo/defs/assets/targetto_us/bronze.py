@@ -2,14 +2,34 @@ import os
 import dagster as dg
 import polars as pl
 from datetime import datetime
+from functools import partial
 from dagster_demo.defs.assets.targetto_us import config as cfg
 from dagster_demo.components.bronze import bronze_processing
 from dagster_demo.components.sensors import (
-    detect_new_files_in_dir,
+    scan_landing_directory,
     process_new_partitions_in_files,
 )
+from dagster_demo.components.partition_index import (
+    files_containing_partitions,
+    index_partitions_in_files,
+)
+from dagster_demo.components.staging import (
+    is_supported_landing_file,
+    stage_landing_files,
+)
 from dagster_demo.defs.resources.freshness_policy import daily_policy
 
+# raw text scan, used by the sensor to index dates and by runs outside of the indexes
+scan_landing_files = partial(
+    pl.scan_csv, infer_schema=False, **cfg.LANDING_READ_OPTIONS
+)
+stage_files = partial(
+    stage_landing_files,
+    directory=cfg.DIRECTORY,
+    read_options=cfg.LANDING_READ_OPTIONS,
+    sort_by=[cfg.DATE_COLUMN],
+)
+
 
 @dg.asset(
     io_manager_key="bronze_polars_delta_append_io_manager",
@@ -23,17 +43,38 @@ from dagster_demo.defs.resources.freshness_policy import daily_policy
     },
     kinds={"polars", "deltalake", "bronze"},
     partitions_def=dg.DailyPartitionsDefinition(start_date=datetime(2025, 8, 8)),
+    # backfills run ranges of dates, each read with one scan and written with one commit
+    backfill_policy=dg.BackfillPolicy.multi_run(
+        max_partitions_per_run=cfg.MAX_PARTITIONS_PER_RUN
+    ),
     freshness_policy=daily_policy,
 )
 def targetto_us_bronze_day_fact(context: dg.AssetExecutionContext) -> pl.LazyFrame:
     """targetto US one-big-table format for each store."""
-    df = pl.scan_csv(cfg.DIRECTORY, separator="|")
-    if context.has_partition_key:  # partitioned runs
-        df = df.filter(pl.col("date") == context.partition_key)
-        if df.limit(1).collect().is_empty():
-            raise ValueError(
-                f"No data available for partition: {context.partition_key}"
+    # partitioned runs, a single date or a range
+    if context.has_partition_key or context.has_partition_key_range:
+        partition_keys = context.partition_keys
+        # only open the files the sensor indexed as containing these dates,
+        # staged to parquet by the first run reading them
+        files_by_partition = files_containing_partitions(
+            asset_name=context.asset_key.path[-1], partition_keys=partition_keys
+        )
+        unindexed = [key for key, files in files_by_partition.items() if not files]
+        if not unindexed:
+            file_paths = sorted(set().union(*files_by_partition.values()))
+            df = pl.scan_parquet(stage_files(file_paths=file_paths))
+        else:
+            context.log.warning(
+                f"Partitions {unindexed} not in partition index, scanning {cfg.DIRECTORY}"
             )
+            df = scan_landing_files(cfg.DIRECTORY)
+        df = df.filter(pl.col("date").is_in(partition_keys))
+        found = df.select(pl.col("date").unique()).collect()["date"].to_list()
+        missing = sorted(set(partition_keys) - set(found))
+        if missing:
+            raise ValueError(f"No data available for partitions: {missing}")
+    else:
+        df = scan_landing_files(cfg.DIRECTORY)
     df = bronze_processing(
         context=context,
         df=df,
@@ -55,11 +96,12 @@ job = dg.define_asset_job(
 )
 def sensor_targetto_us_bronze_day_fact(context: dg.SensorEvaluationContext):
     """
-    Sensor that detects new files and launches partitioned runs for each unique date.
-    Each partition (date) found in new files triggers a separate RunRequest.
+    Sensor that detects new files and launches partitioned runs for the unique dates.
+    Consecutive dates found in new files are grouped into partition range runs
+    of up to `MAX_PARTITIONS_PER_RUN` dates.
     """
     # Detect which files are new
-    new_file_paths = detect_new_files_in_dir(context=context, directory=cfg.DIRECTORY)
+    new_file_paths = scan_landing_directory(context=context, directory=cfg.DIRECTORY)
 
     if not new_file_paths:
         yield dg.SkipReason("No new files found")
@@ -69,17 +111,25 @@ def sensor_targetto_us_bronze_day_fact(context: dg.SensorEvaluationContext):
         f"Found {len(new_file_paths)} new files: {[os.path.basename(f) for f in new_file_paths]}"
     )
 
-    # Parse the new files and extract unique date partitions
-    df = pl.scan_csv(new_file_paths, separator="|")
-    unique_dates = df.select(pl.col("date")).unique().collect()["date"].to_list()
+    # Index the date partitions of each new file, reading only the date column.
+    # Staging to parquet is left to the runs, so the tick never sorts or collects a file
+    unique_dates = index_partitions_in_files(
+        asset_name=targetto_us_bronze_day_fact.key.path[-1],
+        file_paths=[f for f in new_file_paths if is_supported_landing_file(f)],
+        partition_col="date",
+        scan_files=scan_landing_files,
+    )
 
     context.log.info(
         f"Found {len(unique_dates)} unique date partitions: {unique_dates}"
     )
 
-    # Generate RunRequests for each partition
+    # Generate RunRequests for ranges of consecutive partitions
     run_requests = process_new_partitions_in_files(
-        partition_keys=unique_dates, asset_name="targetto_us_bronze"
+        partition_keys=unique_dates,
+        asset_name="targetto_us_bronze",
+        partitions_def=targetto_us_bronze_day_fact.partitions_def,
+        max_partitions_per_run=cfg.MAX_PARTITIONS_PER_RUN,
     )
 
     for run_request in run_requests:
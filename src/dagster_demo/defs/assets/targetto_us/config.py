@@ -1,14 +1,27 @@
 # EXAMPLE DATA: faker/data/files_per_stroe
 
-from dagster_demo.components.config_utils import build_retailer_config
+from dagster_demo.components.config_utils import (
+    build_data_provider_code,
+    build_retailer_config,
+)
 
 RETAILER_ID = 1003
 DATA_SOURCE_NAME = "delta-share"
 DATE_COLUMN = "date"
+# polars read options of the pipe-delimited text files in the landing zone
+LANDING_READ_OPTIONS = {"separator": "|"}
+# consecutive dates read and committed by a single bronze run (sensor and backfills)
+MAX_PARTITIONS_PER_RUN = 31
 
 DIRECTORY, SECURE_GROUP_KEY, RETAILER_NAME, REGION, COUNTRY = build_retailer_config(
     RETAILER_ID
 )
+DATA_PROVIDER_CODE = build_data_provider_code(RETAILER_ID)
+
+# Bronze storage: "string" casts every column to string, "typed" stores the columns of
+# BRONZE_SCHEMA_HINT with their declared dtype (see carretwo_fr)
+BRONZE_STORAGE_MODE = "string"
+BRONZE_SCHEMA_HINT = {}
 
 # SCD Type 2 tracked columns - columns that trigger dimension versioning when changed
 PROD_DIM_SCD_COLS = [
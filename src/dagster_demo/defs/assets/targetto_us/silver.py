@@ -1,12 +1,19 @@
 import dagster as dg
 import polars as pl
+from dagster_demo.components.polars_schemas import (
+    prod_dim_key_map_cols,
+    site_dim_key_map_cols,
+)
+from dagster_demo.components.constants import DATA_PROVIDER_CODE_TAG
 from dagster_demo.defs.assets.targetto_us import config as cfg
 from dagster_demo.components.silver import column_name_is_in_data_model
 from dagster_demo.components.silver import (
+    SilverFactConfig,
+    select_new_bronze_rows,
     silver_fact_processing,
     silver_prod_dim_processing,
     silver_site_dim_processing,
-    silver_fact_downsample,
+    silver_fact_rollup,
 )
 
 
@@ -20,11 +27,24 @@ from dagster_demo.components.silver import (
         "region": cfg.REGION,
         "country": cfg.COUNTRY,
         "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
+        "partition_by": ["time_period_end_month"],
+        # largest bronze history: write in batches on the streaming engine
+        "execution_mode": "streaming",
+    },
+    ins={
+        "targetto_us_silver_prod_dim": dg.AssetIn(
+            metadata={"columns": prod_dim_key_map_cols}
+        ),
+        "targetto_us_silver_site_dim": dg.AssetIn(
+            metadata={"columns": site_dim_key_map_cols}
+        ),
     },
     kinds={"polars", "deltalake", "silver"},
+    tags={DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE},
 )
 def targetto_us_silver_day_fact(
     context: dg.AssetExecutionContext,
+    config: SilverFactConfig,
     targetto_us_bronze_day_fact: pl.LazyFrame,
     targetto_us_silver_prod_dim: pl.LazyFrame,
     targetto_us_silver_site_dim: pl.LazyFrame,
@@ -43,7 +63,12 @@ def targetto_us_silver_day_fact(
             raise ValueError(
                 f"Column {col} exists in the standard data model and should be mapped directly."
             )
-    df = targetto_us_bronze_day_fact.select(
+    df = select_new_bronze_rows(
+        context=context,
+        df=targetto_us_bronze_day_fact,
+        input_name="targetto_us_bronze_day_fact",
+        full_rebuild=config.full_rebuild,
+    ).select(
         pl.col("date").str.to_date("%Y-%m-%d").alias("time_period_end_date"),
         pl.col("product_id").alias("prod_id"),
         pl.col("store_id").alias("site_id"),
@@ -60,6 +85,7 @@ def targetto_us_silver_day_fact(
         pl.col("created_at_date"),
         pl.col("data_source"),
         pl.col("data_provider_code"),
+        pl.col("row_fingerprint"),
         # non standard columns into extra attrs
         pl.struct([pl.col(c) for c in non_standard_fact_cols]).alias(
             "extra_attributes"
@@ -72,6 +98,7 @@ def targetto_us_silver_day_fact(
         site_dim=targetto_us_silver_site_dim,
         granularity="daily",
         antitrust_masking_selection=None,
+        full_rebuild=config.full_rebuild,
     )
     return df
 
@@ -86,11 +113,15 @@ def targetto_us_silver_day_fact(
         "region": cfg.REGION,
         "country": cfg.COUNTRY,
         "merge_predicate": "s.prod_key = t.prod_key",
+        "dimension_cache": True,
     },
     kinds={"polars", "deltalake", "silver"},
+    tags={DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE},
 )
 def targetto_us_silver_prod_dim(
-    context: dg.AssetExecutionContext, targetto_us_bronze_day_fact: pl.LazyFrame
+    context: dg.AssetExecutionContext,
+    targetto_us_bronze_day_fact: pl.LazyFrame,
+    corporate_product_master_data: pl.LazyFrame,
 ) -> pl.LazyFrame:
     non_standard_prod_dim_cols = [
         "product_id",
@@ -128,6 +159,7 @@ def targetto_us_silver_prod_dim(
         context=context,
         incoming_dim=df,
         scd_cols=cfg.PROD_DIM_SCD_COLS,
+        corporate_master_data=corporate_product_master_data,
     )
     return df
 
@@ -142,11 +174,15 @@ def targetto_us_silver_prod_dim(
         "region": cfg.REGION,
         "country": cfg.COUNTRY,
         "merge_predicate": "s.site_key = t.site_key",
+        "dimension_cache": True,
     },
     kinds={"polars", "deltalake", "silver"},
+    tags={DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE},
 )
 def targetto_us_silver_site_dim(
-    context: dg.AssetExecutionContext, targetto_us_bronze_day_fact: pl.LazyFrame
+    context: dg.AssetExecutionContext,
+    targetto_us_bronze_day_fact: pl.LazyFrame,
+    corporate_site_master_data: pl.LazyFrame,
 ) -> pl.LazyFrame:
     non_standard_site_dim_cols = [
         "store_id",
@@ -186,54 +222,70 @@ def targetto_us_silver_site_dim(
         context=context,
         incoming_dim=df,
         scd_cols=cfg.SITE_DIM_SCD_COLS,
+        corporate_master_data=corporate_site_master_data,
     )
     return df
 
 
-@dg.asset(
-    io_manager_key="silver_polars_delta_merge_io_manager",
-    automation_condition=dg.AutomationCondition.eager(),
-    group_name=cfg.RETAILER_NAME,
-    metadata={
-        "ssid": cfg.RETAILER_ID,
-        "name": cfg.RETAILER_NAME,
-        "region": cfg.REGION,
-        "country": cfg.COUNTRY,
-        "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
-    },
-    kinds={"polars", "deltalake", "silver"},
-    tags={"aggregation": "day_to_week"},
-)
-def targetto_us_silver_week_fact(
-    context: dg.AssetExecutionContext, targetto_us_silver_day_fact: pl.LazyFrame
-) -> pl.LazyFrame:
-    df = silver_fact_downsample(
-        context=context, df=targetto_us_silver_day_fact, sampling_period="1w"
-    )
-    return df
-
-
-@dg.asset(
-    io_manager_key="silver_polars_delta_merge_io_manager",
-    automation_condition=dg.AutomationCondition.eager(),
-    group_name=cfg.RETAILER_NAME,
-    metadata={
-        "ssid": cfg.RETAILER_ID,
-        "name": cfg.RETAILER_NAME,
-        "region": cfg.REGION,
-        "country": cfg.COUNTRY,
-        "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
+@dg.multi_asset(
+    outs={
+        "targetto_us_silver_week_fact": dg.AssetOut(
+            # only unselected outputs are skipped
+            is_required=False,
+            io_manager_key="silver_polars_delta_merge_io_manager",
+            automation_condition=dg.AutomationCondition.eager(),
+            group_name=cfg.RETAILER_NAME,
+            metadata={
+                "ssid": cfg.RETAILER_ID,
+                "name": cfg.RETAILER_NAME,
+                "region": cfg.REGION,
+                "country": cfg.COUNTRY,
+                "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
+                "partition_by": ["time_period_end_month"],
+            },
+            kinds={"polars", "deltalake", "silver"},
+            tags={
+                "aggregation": "day_to_week",
+                DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE,
+            },
+        ),
+        "targetto_us_silver_month_fact": dg.AssetOut(
+            # only unselected outputs are skipped
+            is_required=False,
+            io_manager_key="silver_polars_delta_merge_io_manager",
+            automation_condition=dg.AutomationCondition.eager(),
+            group_name=cfg.RETAILER_NAME,
+            metadata={
+                "ssid": cfg.RETAILER_ID,
+                "name": cfg.RETAILER_NAME,
+                "region": cfg.REGION,
+                "country": cfg.COUNTRY,
+                "merge_predicate": "s.time_period_end_date = t.time_period_end_date AND s.prod_id = t.prod_id AND s.site_id = t.site_id",
+                "partition_by": ["time_period_end_month"],
+            },
+            kinds={"polars", "deltalake", "silver"},
+            tags={
+                "aggregation": "day_to_month",
+                DATA_PROVIDER_CODE_TAG: cfg.DATA_PROVIDER_CODE,
+            },
+        ),
     },
-    kinds={"polars", "deltalake", "silver"},
-    tags={"aggregation": "day_to_month"},
+    can_subset=True,
 )
-def targetto_us_silver_month_fact(
-    context: dg.AssetExecutionContext, targetto_us_silver_day_fact: pl.LazyFrame
-) -> pl.LazyFrame:
-    df = silver_fact_downsample(
-        context=context, df=targetto_us_silver_day_fact, sampling_period="1mo"
+def targetto_us_silver_fact_rollup(
+    context: dg.AssetExecutionContext,
+    config: SilverFactConfig,
+    targetto_us_silver_day_fact: pl.LazyFrame,
+):
+    yield from silver_fact_rollup(
+        context=context,
+        df=targetto_us_silver_day_fact,
+        sampling_periods={
+            "targetto_us_silver_week_fact": "1w",
+            "targetto_us_silver_month_fact": "1mo",
+        },
+        full_rebuild=config.full_rebuild,
     )
-    return df
 
 
 defs = dg.Definitions(
@@ -241,7 +293,6 @@ defs = dg.Definitions(
         targetto_us_silver_day_fact,
         targetto_us_silver_prod_dim,
         targetto_us_silver_site_dim,
-        targetto_us_silver_week_fact,
-        targetto_us_silver_month_fact,
+        targetto_us_silver_fact_rollup,
     ],
 )
@@ -0,0 +1,84 @@
+import os
+import dagster as dg
+from dagster_demo.components.constants import KEY_DICTIONARY_ROOT
+from dagster_demo.components.maintenance import (
+    FACT_Z_ORDER_COLS,
+    find_delta_tables,
+    maintain_delta_table,
+)
+
+
+class DeltaMaintenanceConfig(dg.Config):
+    # key dictionaries are laid out as <root>/<retailer id>/<natural key>
+    roots: list[str] = ["data/bronze", "data/silver", "data/gold", KEY_DICTIONARY_ROOT]
+    target_file_size_mb: int = 128
+    z_order_cols: list[str] = FACT_Z_ORDER_COLS
+    # files unreferenced for longer than this are deleted, time travel stops there
+    retention_hours: int = 168
+
+
+@dg.op
+def maintain_delta_tables(
+    context: dg.OpExecutionContext, config: DeltaMaintenanceConfig
+) -> list[dict]:
+    """Compact (Z-order for facts), checkpoint and vacuum every delta table under `config.roots`.
+    Tables written by IO managers get an observation on their asset with before/after file counts."""
+    reports = []
+    for table_uri in find_delta_tables(config.roots):
+        report = maintain_delta_table(
+            table_uri=table_uri,
+            target_file_size_mb=config.target_file_size_mb,
+            retention_hours=config.retention_hours,
+            z_order_cols=config.z_order_cols,
+        )
+        reports.append(report)
+        # IO managers write assets to <root>/public/<asset name>
+        schema, table_name = table_uri.split(os.sep)[-2:]
+        if schema == "public":
+            context.log_event(
+                dg.AssetObservation(
+                    asset_key=table_name,
+                    metadata={
+                        "Maintenance": dg.MetadataValue.text(report["operation"]),
+                        "Files before": dg.MetadataValue.int(report["files_before"]),
+                        "Files after": dg.MetadataValue.int(report["files_after"]),
+                        "Bytes after": dg.MetadataValue.int(report["bytes_after"]),
+                        "Files vacuumed": dg.MetadataValue.int(
+                            report["files_vacuumed"]
+                        ),
+                        "Table version": dg.MetadataValue.int(report["table_version"]),
+                    },
+                )
+            )
+
+    context.add_output_metadata(
+        {
+            "Tables": dg.MetadataValue.int(len(reports)),
+            "Files before": dg.MetadataValue.int(
+                sum(report["files_before"] for report in reports)
+            ),
+            "Files after": dg.MetadataValue.int(
+                sum(report["files_after"] for report in reports)
+            ),
+            "Report": dg.MetadataValue.json(reports),
+        }
+    )
+    return reports
+
+
+@dg.job
+def delta_maintenance_job():
+    maintain_delta_tables()
+
+
+delta_maintenance_schedule = dg.ScheduleDefinition(
+    job=delta_maintenance_job,
+    cron_schedule="0 3 * * *",  # nightly, away from the daily retailer drops
+    default_status=dg.DefaultScheduleStatus.RUNNING,
+)
+
+
+defs = dg.Definitions(
+    jobs=[delta_maintenance_job],
+    schedules=[delta_maintenance_schedule],
+)
@@ -1,5 +1,6 @@
 import dagster as dg
+from dagster_demo.components.config_utils import build_data_provider_code
 from dagster_demo.components.constants import RETAILER_CONFIG
 
-_data_providers_list = [f"cds_{key}" for key in RETAILER_CONFIG.keys()]
+_data_providers_list = [build_data_provider_code(key) for key in RETAILER_CONFIG.keys()]
 data_provider_partitions = dg.StaticPartitionsDefinition(_data_providers_list)
@@ -7,6 +7,8 @@ from dagster_delta import (
     SchemaMode,
 )
 from dagster_delta.config import LocalConfig
+from dagster_demo.components.change_data_feed import CHANGE_DATA_FEED_TABLE_CONFIG
+from dagster_demo.components.delta_io_manager import LakehouseDeltaLakePolarsIOManager
 
 defs = dg.Definitions(
     resources={
@@ -16,7 +18,8 @@ defs = dg.Definitions(
             schema_mode=SchemaMode.merge,
             storage_options=LocalConfig(),
         ),  # append and be flexible with schema in bronze layer
-        "silver_polars_delta_merge_io_manager": DeltaLakePolarsIOManager(
+        # assets with metadata={"execution_mode": "streaming"} are written in batches on the streaming engine
+        "silver_polars_delta_merge_io_manager": LakehouseDeltaLakePolarsIOManager(
             root_uri="data/silver",
             mode=WriteMode.merge,
             merge_config=MergeConfig(
@@ -25,8 +28,11 @@ defs = dg.Definitions(
                 target_alias="t",
             ),
             storage_options=LocalConfig(),
+            # gold reads the silver row changes from the change data feed
+            table_config=CHANGE_DATA_FEED_TABLE_CONFIG,
+            write_batch_budget_mb=1024,
         ),  # requires passing merge predicate: metadata={"merge_predicate": "s.foo = t.foo AND s.bar = t.bar"},
-        "gold_polars_delta_merge_io_manager": DeltaLakePolarsIOManager(
+        "gold_polars_delta_merge_io_manager": LakehouseDeltaLakePolarsIOManager(
             root_uri="data/gold",
             mode=WriteMode.merge,
             merge_config=MergeConfig(
@@ -35,6 +41,7 @@ defs = dg.Definitions(
                 target_alias="t",
             ),
             storage_options=LocalConfig(),
+            write_batch_budget_mb=1024,
         ),
     }
 )